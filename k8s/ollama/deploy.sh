@@ -7,7 +7,7 @@ set -e
 
 # Configuration
 NAMESPACE="robert"
-MODEL="${1:-qwen2:1.5b}"  # Default model, override with: ./deploy.sh phi3:mini
+MODEL="${1:-qwen2:1.5b-instruct-q4_0}"  # Default model, override with: ./deploy.sh phi3:mini
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
@@ -13,7 +13,7 @@ import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Set, Tuple
 from dataclasses import dataclass, asdict
 
 
@@ -47,6 +47,8 @@ class MeetingCalendar:
 
     def __init__(self, db_path: str = "meetings.db"):
         self.db_path = db_path
+        # Local tz for "now" in time-window queries
+        self._tz = datetime.now().astimezone().tzinfo
         self._init_db()
 
     def _init_db(self):
@@ -78,6 +80,14 @@ class MeetingCalendar:
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_project ON meetings(project)
             """)
+            # IMAP sync watermark per folder (reset when UIDVALIDITY changes)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    folder TEXT PRIMARY KEY,
+                    uidvalidity INTEGER NOT NULL,
+                    last_uid INTEGER NOT NULL
+                )
+            """)
             conn.commit()
 
     def _detect_platform(self, join_url: str) -> str:
@@ -90,6 +100,23 @@ class MeetingCalendar:
             return "zoom"
         return "unknown"
 
+    def _meeting_row(self, meeting: Meeting) -> tuple:
+        """Convert a Meeting to the column tuple used by INSERTs"""
+        return (
+            meeting.project,
+            meeting.title,
+            meeting.start_time.isoformat(),
+            meeting.end_time.isoformat() if meeting.end_time else None,
+            meeting.join_url,
+            meeting.platform or self._detect_platform(meeting.join_url),
+            meeting.from_address,
+            meeting.to_address,
+            meeting.status,
+            meeting.message_id,
+            meeting.created_at.isoformat(),
+            meeting.raw_ics
+        )
+
     def add_meeting(self, meeting: Meeting) -> Optional[int]:
         """Add a meeting to the calendar. Returns meeting ID or None if duplicate."""
         try:
@@ -99,29 +126,39 @@ class MeetingCalendar:
                     (project, title, start_time, end_time, join_url, platform,
                      from_address, to_address, status, message_id, created_at, raw_ics)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    meeting.project,
-                    meeting.title,
-                    meeting.start_time.isoformat(),
-                    meeting.end_time.isoformat() if meeting.end_time else None,
-                    meeting.join_url,
-                    meeting.platform or self._detect_platform(meeting.join_url),
-                    meeting.from_address,
-                    meeting.to_address,
-                    meeting.status,
-                    meeting.message_id,
-                    meeting.created_at.isoformat(),
-                    meeting.raw_ics
-                ))
+                """, self._meeting_row(meeting))
                 conn.commit()
                 return cursor.lastrowid
         except sqlite3.IntegrityError:
             # Duplicate message_id - meeting already exists
             return None
 
+    def add_meetings(self, meetings: List[Meeting]) -> List[Optional[int]]:
+        """Add several meetings in a single transaction.
+
+        Returns a list aligned with the input: the new meeting ID, or None
+        where the message_id already existed.
+        """
+        ids: List[Optional[int]] = []
+        if not meetings:
+            return ids
+
+        with sqlite3.connect(self.db_path) as conn:
+            for meeting in meetings:
+                cursor = conn.execute("""
+                    INSERT INTO meetings
+                    (project, title, start_time, end_time, join_url, platform,
+                     from_address, to_address, status, message_id, created_at, raw_ics)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(message_id) DO NOTHING
+                """, self._meeting_row(meeting))
+                ids.append(cursor.lastrowid if cursor.rowcount > 0 else None)
+            conn.commit()
+        return ids
+
     def get_upcoming(self, minutes_ahead: int = 5) -> List[Meeting]:
         """Get meetings starting within the next N minutes"""
-        now = datetime.now().astimezone()
+        now = datetime.now(self._tz)
         cutoff = now + timedelta(minutes=minutes_ahead)
 
         with sqlite3.connect(self.db_path) as conn:
@@ -136,6 +173,54 @@ class MeetingCalendar:
 
             return [self._row_to_meeting(row) for row in cursor.fetchall()]
 
+    def get_upcoming_lite(self, minutes_ahead: int = 5) -> List[Tuple[int, str, datetime]]:
+        """Like get_upcoming, but returns only (id, title, start_time) tuples.
+
+        Used on the per-cycle path so raw_ics and other unused columns are
+        never copied out of SQLite.
+        """
+        now = datetime.now(self._tz)
+        cutoff = now + timedelta(minutes=minutes_ahead)
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT id, title, start_time FROM meetings
+                WHERE status = 'pending'
+                AND datetime(start_time) <= datetime(?)
+                AND datetime(start_time) >= datetime(?)
+                ORDER BY start_time ASC
+            """, (cutoff.isoformat(), (now - timedelta(minutes=10)).isoformat()))
+
+            return [(row[0], row[1], datetime.fromisoformat(row[2])) for row in cursor.fetchall()]
+
+    def get_next_pending(self) -> Optional[Tuple[int, str, datetime]]:
+        """Get (id, title, start_time) of the earliest pending meeting"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("""
+                SELECT id, title, start_time FROM meetings
+                WHERE status = 'pending'
+                ORDER BY start_time ASC
+                LIMIT 1
+            """).fetchone()
+            return (row[0], row[1], datetime.fromisoformat(row[2])) if row else None
+
+    def get(self, meeting_id: int) -> Optional[Meeting]:
+        """Get a single meeting by ID"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("""
+                SELECT * FROM meetings WHERE id = ?
+            """, (meeting_id,)).fetchone()
+            return self._row_to_meeting(row) if row else None
+
+    def get_message_ids(self) -> Set[str]:
+        """Get the message IDs of all stored meetings"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT message_id FROM meetings WHERE message_id IS NOT NULL
+            """)
+            return {row[0] for row in cursor}
+
     def get_all_pending(self) -> List[Meeting]:
         """Get all pending meetings"""
         with sqlite3.connect(self.db_path) as conn:
@@ -166,6 +251,34 @@ class MeetingCalendar:
             """, (status, meeting_id))
             conn.commit()
 
+    def get_sync_state(self, folder: str = "INBOX") -> Optional[Tuple[int, int]]:
+        """Get the stored (uidvalidity, last_uid) watermark for a folder"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("""
+                SELECT uidvalidity, last_uid FROM sync_state WHERE folder = ?
+            """, (folder,)).fetchone()
+            return (row[0], row[1]) if row else None
+
+    def set_sync_state(self, folder: str, uidvalidity: int, last_uid: int):
+        """Store the IMAP watermark for a folder.
+
+        last_uid only moves forward unless UIDVALIDITY changed, in which
+        case the old UIDs are meaningless and the watermark is replaced.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                INSERT INTO sync_state (folder, uidvalidity, last_uid)
+                VALUES (?, ?, ?)
+                ON CONFLICT(folder) DO UPDATE SET
+                    last_uid = CASE
+                        WHEN sync_state.uidvalidity = excluded.uidvalidity
+                        THEN MAX(sync_state.last_uid, excluded.last_uid)
+                        ELSE excluded.last_uid
+                    END,
+                    uidvalidity = excluded.uidvalidity
+            """, (folder, uidvalidity, last_uid))
+            conn.commit()
+
     def _row_to_meeting(self, row: sqlite3.Row) -> Meeting:
         """Convert database row to Meeting object"""
         return Meeting(
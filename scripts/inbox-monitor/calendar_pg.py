@@ -7,21 +7,75 @@ Falls back to SQLite for local development.
 """
 
 import os
+import io
 import json
+import select
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Set, Tuple
 from dataclasses import dataclass, asdict
 
 # Try PostgreSQL first, fall back to SQLite
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    import psycopg2.pool
+    from psycopg2.extras import RealDictCursor, execute_values
     HAS_POSTGRES = True
 except ImportError:
     HAS_POSTGRES = False
 
 
+# Batches at least this big (e.g. the first 14-day sync) are loaded with COPY
+_COPY_MIN_ROWS = 50
+
+# Hot-path queries, PREPAREd once per pooled connection so Postgres skips
+# parse/plan on every poll. Param types are inferred from the columns.
+_STATEMENTS = {
+    # Single upper bound on start_time so the partial pending index is a range scan
+    "upcoming_stmt": """
+        SELECT * FROM meetings
+        WHERE status = 'pending'
+        AND start_time <= $1
+        AND (
+            -- Case 1: Meeting starts soon (within minutes_ahead)
+            start_time >= $2
+            OR
+            -- Case 2: Meeting already started but still ongoing
+            end_time IS NULL OR end_time > $3
+        )
+        ORDER BY start_time ASC
+        LIMIT 16
+    """,
+    "all_pending_stmt": """
+        SELECT * FROM meetings
+        WHERE status = 'pending'
+        ORDER BY start_time ASC
+    """,
+    "by_uid_stmt": """
+        SELECT * FROM meetings
+        WHERE uid = $1
+        ORDER BY created_at DESC
+        LIMIT 1
+    """,
+    "add_meeting_stmt": """
+        INSERT INTO meetings
+        (project, title, start_time, end_time, join_url, platform,
+         from_address, to_address, status, message_id, created_at, raw_ics, uid)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+        RETURNING id
+    """,
+}
+
+if HAS_POSTGRES:
+    class _PreparedConnection(psycopg2.extensions.connection):
+        """Connection that remembers which statements it has PREPAREd"""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.prepared: Set[str] = set()
+
+
 @dataclass
 class Meeting:
     """A scheduled meeting"""
@@ -47,6 +101,13 @@ class Meeting:
         d['created_at'] = self.created_at.isoformat() if self.created_at else None
         return d
 
+    def overlaps(self, start_time: datetime, end_time: Optional[datetime]) -> bool:
+        """Check if this meeting overlaps [start_time, end_time) (1 hour if no end)"""
+        if end_time is None:
+            end_time = start_time + timedelta(hours=1)
+        own_end = self.end_time or self.start_time + timedelta(hours=1)
+        return self.start_time < end_time and own_end > start_time
+
 
 class MeetingCalendar:
     """PostgreSQL-based meeting calendar with SQLite fallback"""
@@ -64,20 +125,90 @@ class MeetingCalendar:
 
         if self.use_postgres:
             print(f"📦 Using PostgreSQL")
+            # Shared by the poll loop and the IDLE thread, so connections
+            # (TCP + TLS + auth) are set up once instead of per query
+            self._pool = psycopg2.pool.ThreadedConnectionPool(
+                1, 8, self.connection_string, connection_factory=_PreparedConnection
+            )
         else:
             print(f"📦 Using SQLite (meetings.db)")
             self.db_path = "meetings.db"
 
         self._init_db()
 
-    def _get_pg_connection(self):
-        """Get PostgreSQL connection"""
-        return psycopg2.connect(self.connection_string)
+    @contextmanager
+    def _conn(self):
+        """Borrow a pooled PostgreSQL connection.
+
+        Commits on success and rolls back on error, like psycopg2's own
+        connection context manager. Connections that died are dropped
+        from the pool instead of being handed out again.
+        """
+        conn = self._pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.putconn(conn, close=bool(conn.closed))
+
+    def _execute(self, cur, name: str, params: tuple = ()):
+        """EXECUTE a statement from _STATEMENTS, PREPAREing it on first use"""
+        conn = cur.connection
+        if name not in conn.prepared:
+            cur.execute(f"PREPARE {name} AS {_STATEMENTS[name]}")
+            conn.prepared.add(name)
+        if params:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+    def listen_upcoming(self):
+        """
+        Take a pooled connection and LISTEN for pending-meeting changes.
+
+        Returns:
+            The listening connection, or None on SQLite
+        """
+        if not self.use_postgres:
+            return None
+        conn = self._pool.getconn()
+        # Notifications are only delivered outside a transaction
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("LISTEN upcoming_meetings")
+        except:
+            self._pool.putconn(conn, close=True)
+            raise
+        return conn
+
+    def wait_upcoming(self, listener, timeout: float) -> bool:
+        """
+        Block until a notification arrives on listener or timeout expires.
+
+        Returns:
+            True if woken by a notification
+        """
+        if not select.select([listener], [], [], timeout)[0]:
+            return False
+        listener.poll()
+        listener.notifies.clear()
+        return True
+
+    def release_listener(self, listener):
+        """Return a listening connection to the pool (closed, since it is in autocommit)"""
+        if listener is not None and not self._pool.closed:
+            self._pool.putconn(listener, close=True)
+
+    def close(self):
+        """Close all pooled connections"""
+        if self.use_postgres:
+            self._pool.closeall()
 
     def _init_db(self):
         """Initialize database schema"""
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         CREATE TABLE IF NOT EXISTS meetings (
@@ -118,6 +249,75 @@ class MeetingCalendar:
                     cur.execute("""
                         CREATE INDEX IF NOT EXISTS idx_meetings_uid ON meetings(uid)
                     """)
+                    # Hot rows only: the upcoming check polls pending meetings by time
+                    cur.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_meetings_pending_start_time
+                        ON meetings(start_time) WHERE status = 'pending'
+                    """)
+                    # Meeting time range (1 hour if no end), as a stored column so
+                    # overlap checks use a GiST index. timestamptz + interval is
+                    # only STABLE, but a fixed hour doesn't depend on the timezone.
+                    cur.execute("""
+                        CREATE OR REPLACE FUNCTION meeting_during(s TIMESTAMPTZ, e TIMESTAMPTZ)
+                        RETURNS TSTZRANGE LANGUAGE sql IMMUTABLE AS $$
+                            SELECT tstzrange(s, COALESCE(e, s + interval '1 hour'), '[)')
+                        $$
+                    """)
+                    cur.execute("""
+                        ALTER TABLE meetings ADD COLUMN IF NOT EXISTS during TSTZRANGE
+                            GENERATED ALWAYS AS (meeting_during(start_time, end_time)) STORED
+                    """)
+                    # No two active meetings may overlap; this also closes the race
+                    # between the IDLE callback and the polling sync
+                    cur.execute("""
+                        DO $$
+                        BEGIN
+                            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'meetings_no_overlap') THEN
+                                ALTER TABLE meetings ADD CONSTRAINT meetings_no_overlap
+                                    EXCLUDE USING gist (during WITH &&)
+                                    WHERE (status NOT IN ('completed', 'cancelled', 'missed', 'declined'));
+                            END IF;
+                        EXCEPTION WHEN exclusion_violation THEN
+                            RAISE WARNING 'meetings_no_overlap not added: existing active meetings overlap';
+                        END $$;
+                    """)
+                    # Wake the upcoming-meeting checker when a pending meeting is
+                    # added or rescheduled (see listen_upcoming)
+                    cur.execute("""
+                        CREATE OR REPLACE FUNCTION notify_upcoming() RETURNS trigger
+                        LANGUAGE plpgsql AS $$
+                        BEGIN
+                            PERFORM pg_notify('upcoming_meetings', NEW.id::text);
+                            RETURN NEW;
+                        END $$
+                    """)
+                    cur.execute("""
+                        DO $$
+                        BEGIN
+                            IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'notify_upcoming') THEN
+                                CREATE TRIGGER notify_upcoming
+                                    AFTER INSERT OR UPDATE OF status, start_time ON meetings
+                                    FOR EACH ROW WHEN (NEW.status = 'pending')
+                                    EXECUTE FUNCTION notify_upcoming();
+                            END IF;
+                        END $$;
+                    """)
+                    # Covering index for check_conflicts: the partial predicate matches
+                    # its status filter and INCLUDE holds every column it selects, so
+                    # conflict checks are index-only scans (no raw_ics heap fetches)
+                    cur.execute("""
+                        CREATE INDEX IF NOT EXISTS meetings_active_range_idx
+                        ON meetings USING gist (during) INCLUDE (id, title, start_time, end_time, status)
+                        WHERE status NOT IN ('completed', 'cancelled', 'missed', 'declined')
+                    """)
+                    # IMAP UID watermark per folder, so syncs only scan new mail
+                    cur.execute("""
+                        CREATE TABLE IF NOT EXISTS scheduler_state (
+                            folder TEXT PRIMARY KEY,
+                            last_seen_uidvalidity BIGINT NOT NULL,
+                            last_seen_uid BIGINT NOT NULL
+                        )
+                    """)
                 conn.commit()
         else:
             with sqlite3.connect(self.db_path) as conn:
@@ -146,6 +346,13 @@ class MeetingCalendar:
                     pass  # Column already exists
                 # Create index on uid
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_uid ON meetings(uid)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS scheduler_state (
+                        folder TEXT PRIMARY KEY,
+                        last_seen_uidvalidity INTEGER NOT NULL,
+                        last_seen_uid INTEGER NOT NULL
+                    )
+                """)
                 conn.commit()
 
     def _detect_platform(self, join_url: str) -> str:
@@ -164,29 +371,9 @@ class MeetingCalendar:
 
         try:
             if self.use_postgres:
-                with self._get_pg_connection() as conn:
+                with self._conn() as conn:
                     with conn.cursor() as cur:
-                        cur.execute("""
-                            INSERT INTO meetings
-                            (project, title, start_time, end_time, join_url, platform,
-                             from_address, to_address, status, message_id, created_at, raw_ics, uid)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                            RETURNING id
-                        """, (
-                            meeting.project,
-                            meeting.title,
-                            meeting.start_time,
-                            meeting.end_time,
-                            meeting.join_url,
-                            platform,
-                            meeting.from_address,
-                            meeting.to_address,
-                            meeting.status,
-                            meeting.message_id,
-                            meeting.created_at,
-                            meeting.raw_ics,
-                            meeting.uid
-                        ))
+                        self._execute(cur, "add_meeting_stmt", self._meeting_row(meeting))
                         result = cur.fetchone()
                         conn.commit()
                         return result[0] if result else None
@@ -215,8 +402,202 @@ class MeetingCalendar:
                     conn.commit()
                     return cursor.lastrowid
         except (psycopg2.IntegrityError if HAS_POSTGRES else sqlite3.IntegrityError):
+            # Duplicate message_id, or (PostgreSQL) an ExclusionViolation from
+            # meetings_no_overlap when another active meeting took the slot
             return None
 
+    def _meeting_row(self, meeting: Meeting, isoformat: bool = False) -> tuple:
+        """Column values for INSERT; isoformat=True for SQLite text timestamps"""
+        ts = (lambda dt: dt.isoformat() if dt else None) if isoformat else (lambda dt: dt)
+        return (
+            meeting.project,
+            meeting.title,
+            ts(meeting.start_time),
+            ts(meeting.end_time),
+            meeting.join_url,
+            meeting.platform or self._detect_platform(meeting.join_url),
+            meeting.from_address,
+            meeting.to_address,
+            meeting.status,
+            meeting.message_id,
+            ts(meeting.created_at),
+            meeting.raw_ics,
+            meeting.uid
+        )
+
+    def add_meetings(self, meetings: List[Meeting]) -> List[Optional[int]]:
+        """Add a batch of meetings in one transaction.
+
+        Returns the new IDs in input order, with None for duplicates
+        (existing message_id) and, on PostgreSQL, for active meetings
+        rejected by the no-overlap constraint.
+        """
+        if not meetings:
+            return []
+
+        if self.use_postgres and len(meetings) >= _COPY_MIN_ROWS:
+            return self.bulk_add_meetings(meetings)
+
+        if self.use_postgres:
+            with self._conn() as conn:
+                with conn.cursor() as cur:
+                    inserted = execute_values(cur, """
+                        INSERT INTO meetings
+                        (project, title, start_time, end_time, join_url, platform,
+                         from_address, to_address, status, message_id, created_at, raw_ics, uid)
+                        VALUES %s
+                        ON CONFLICT DO NOTHING
+                        RETURNING id, message_id
+                    """, [self._meeting_row(m) for m in meetings], page_size=200, fetch=True)
+            ids = {message_id: meeting_id for meeting_id, message_id in inserted}
+            # A message_id repeated within the batch is only inserted once
+            return [ids.pop(m.message_id, None) for m in meetings]
+        else:
+            ids = []
+            with sqlite3.connect(self.db_path) as conn:
+                for m in meetings:
+                    cursor = conn.execute("""
+                        INSERT INTO meetings
+                        (project, title, start_time, end_time, join_url, platform,
+                         from_address, to_address, status, message_id, created_at, raw_ics, uid)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(message_id) DO NOTHING
+                    """, self._meeting_row(m, isoformat=True))
+                    ids.append(cursor.lastrowid if cursor.rowcount > 0 else None)
+                conn.commit()
+            return ids
+
+    def bulk_add_meetings(self, meetings: List[Meeting]) -> List[Optional[int]]:
+        """Add a large batch (e.g. the first 14-day sync) via COPY.
+
+        Rows are streamed into a temp staging table, then moved with one
+        INSERT ... SELECT so duplicates and overlaps are skipped exactly as
+        in add_meetings(), which has the same return value.
+        """
+        if not self.use_postgres:
+            return self.add_meetings(meetings)
+
+        def field(value) -> str:
+            # COPY text format: \N is NULL; backslash, tab and newlines are escaped
+            if value is None:
+                return "\\N"
+            value = value.isoformat() if isinstance(value, datetime) else str(value)
+            return (value.replace("\\", "\\\\").replace("\t", "\\t")
+                    .replace("\n", "\\n").replace("\r", "\\r"))
+
+        buf = io.StringIO()
+        for m in meetings:
+            buf.write("\t".join(field(v) for v in self._meeting_row(m)) + "\n")
+        buf.seek(0)
+
+        columns = ("project, title, start_time, end_time, join_url, platform, "
+                   "from_address, to_address, status, message_id, created_at, raw_ics, uid")
+        with self._conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    CREATE TEMP TABLE meetings_staging ON COMMIT DROP AS
+                    SELECT {columns} FROM meetings WITH NO DATA
+                """)
+                cur.copy_expert(f"COPY meetings_staging ({columns}) FROM STDIN", buf)
+                cur.execute(f"""
+                    INSERT INTO meetings ({columns})
+                    SELECT {columns} FROM meetings_staging
+                    ON CONFLICT DO NOTHING
+                    RETURNING id, message_id
+                """)
+                inserted = cur.fetchall()
+        ids = {message_id: meeting_id for meeting_id, message_id in inserted}
+        return [ids.pop(m.message_id, None) for m in meetings]
+
+    def get_existing_message_ids(self, message_ids: List[str]) -> Set[str]:
+        """Return which of the given message IDs are already stored"""
+        if not message_ids:
+            return set()
+
+        if self.use_postgres:
+            with self._conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT message_id FROM meetings WHERE message_id = ANY(%s)
+                    """, (list(message_ids),))
+                    return {row[0] for row in cur.fetchall()}
+        else:
+            with sqlite3.connect(self.db_path) as conn:
+                placeholders = ','.join('?' * len(message_ids))
+                cursor = conn.execute(f"""
+                    SELECT message_id FROM meetings WHERE message_id IN ({placeholders})
+                """, list(message_ids))
+                return {row[0] for row in cursor.fetchall()}
+
+    def get_recent_message_ids(self, days: int = 14) -> Set[str]:
+        """Message IDs of meetings stored in the last N days"""
+        since = datetime.now().astimezone() - timedelta(days=days)
+        if self.use_postgres:
+            with self._conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT message_id FROM meetings WHERE created_at > %s
+                    """, (since,))
+                    return {row[0] for row in cur.fetchall() if row[0]}
+        else:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    SELECT message_id FROM meetings WHERE datetime(created_at) > datetime(?)
+                """, (since.isoformat(),))
+                return {row[0] for row in cursor.fetchall() if row[0]}
+
+    def get_sync_state(self, folder: str = "INBOX") -> Optional[Tuple[int, int]]:
+        """Get the stored (uidvalidity, last_uid) watermark for a folder"""
+        if self.use_postgres:
+            with self._conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT last_seen_uidvalidity, last_seen_uid FROM scheduler_state WHERE folder = %s
+                    """, (folder,))
+                    row = cur.fetchone()
+        else:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute("""
+                    SELECT last_seen_uidvalidity, last_seen_uid FROM scheduler_state WHERE folder = ?
+                """, (folder,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_sync_state(self, folder: str, uidvalidity: int, last_uid: int):
+        """Store the IMAP watermark for a folder.
+
+        last_uid only moves forward unless UIDVALIDITY changed, in which
+        case the old UIDs are meaningless and the watermark is replaced.
+        """
+        if self.use_postgres:
+            with self._conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        INSERT INTO scheduler_state (folder, last_seen_uidvalidity, last_seen_uid)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT (folder) DO UPDATE SET
+                            last_seen_uid = CASE
+                                WHEN scheduler_state.last_seen_uidvalidity = EXCLUDED.last_seen_uidvalidity
+                                THEN GREATEST(scheduler_state.last_seen_uid, EXCLUDED.last_seen_uid)
+                                ELSE EXCLUDED.last_seen_uid
+                            END,
+                            last_seen_uidvalidity = EXCLUDED.last_seen_uidvalidity
+                    """, (folder, uidvalidity, last_uid))
+                conn.commit()
+        else:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT INTO scheduler_state (folder, last_seen_uidvalidity, last_seen_uid)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(folder) DO UPDATE SET
+                        last_seen_uid = CASE
+                            WHEN scheduler_state.last_seen_uidvalidity = excluded.last_seen_uidvalidity
+                            THEN MAX(scheduler_state.last_seen_uid, excluded.last_seen_uid)
+                            ELSE excluded.last_seen_uid
+                        END,
+                        last_seen_uidvalidity = excluded.last_seen_uidvalidity
+                """, (folder, uidvalidity, last_uid))
+                conn.commit()
+
     def get_upcoming(self, minutes_ahead: int = 5) -> List[Meeting]:
         """Get meetings starting within the next N minutes OR already started but still ongoing.
 
@@ -228,20 +609,9 @@ class MeetingCalendar:
         past_cutoff = now - timedelta(minutes=10)
 
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("""
-                        SELECT * FROM meetings
-                        WHERE status = 'pending'
-                        AND (
-                            -- Case 1: Meeting starts soon (within minutes_ahead)
-                            (start_time <= %s AND start_time >= %s)
-                            OR
-                            -- Case 2: Meeting already started but still ongoing
-                            (start_time < %s AND (end_time IS NULL OR end_time > %s))
-                        )
-                        ORDER BY start_time ASC
-                    """, (cutoff, past_cutoff, now, now))
+                    self._execute(cur, "upcoming_stmt", (cutoff, past_cutoff, now))
                     return [self._row_to_meeting(row) for row in cur.fetchall()]
         else:
             with sqlite3.connect(self.db_path) as conn:
@@ -263,13 +633,9 @@ class MeetingCalendar:
     def get_all_pending(self) -> List[Meeting]:
         """Get all pending meetings"""
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("""
-                        SELECT * FROM meetings
-                        WHERE status = 'pending'
-                        ORDER BY start_time ASC
-                    """)
+                    self._execute(cur, "all_pending_stmt")
                     return [self._row_to_meeting(row) for row in cur.fetchall()]
         else:
             with sqlite3.connect(self.db_path) as conn:
@@ -284,7 +650,7 @@ class MeetingCalendar:
     def get_by_project(self, project: str) -> List[Meeting]:
         """Get all meetings for a project"""
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("""
                         SELECT * FROM meetings
@@ -311,14 +677,9 @@ class MeetingCalendar:
             return None
 
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("""
-                        SELECT * FROM meetings
-                        WHERE uid = %s
-                        ORDER BY created_at DESC
-                        LIMIT 1
-                    """, (uid,))
+                    self._execute(cur, "by_uid_stmt", (uid,))
                     row = cur.fetchone()
                     return self._row_to_meeting(row) if row else None
         else:
@@ -342,7 +703,7 @@ class MeetingCalendar:
             exclude_id: Meeting ID to exclude from conflict check (for updates)
 
         Returns:
-            List of conflicting meetings
+            List of conflicting meetings (only id, title, times and status are loaded)
         """
         # Default to 1 hour duration if no end time
         if end_time is None:
@@ -353,15 +714,14 @@ class MeetingCalendar:
         excluded_statuses = ('completed', 'cancelled', 'missed', 'declined')
 
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self._conn() as conn:
+                with conn.cursor() as cur:
                     query = """
-                        SELECT * FROM meetings
+                        SELECT id, title, start_time, end_time, status FROM meetings
                         WHERE status NOT IN %s
-                        AND start_time < %s
-                        AND (end_time > %s OR (end_time IS NULL AND start_time + interval '1 hour' > %s))
+                        AND during && tstzrange(%s, %s, '[)')
                     """
-                    params = [excluded_statuses, end_time, start_time, start_time]
+                    params = [excluded_statuses, start_time, end_time]
 
                     if exclude_id is not None:
                         query += " AND id != %s"
@@ -369,14 +729,14 @@ class MeetingCalendar:
 
                     query += " ORDER BY start_time ASC"
                     cur.execute(query, params)
-                    return [self._row_to_meeting(row) for row in cur.fetchall()]
+                    return [self._conflict_from_row(*row) for row in cur.fetchall()]
         else:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 # SQLite doesn't support tuples directly, use IN with multiple placeholders
                 status_placeholders = ','.join('?' * len(excluded_statuses))
                 query = f"""
-                    SELECT * FROM meetings
+                    SELECT id, title, start_time, end_time, status FROM meetings
                     WHERE status NOT IN ({status_placeholders})
                     AND datetime(start_time) < datetime(?)
                     AND (
@@ -392,28 +752,49 @@ class MeetingCalendar:
 
                 query += " ORDER BY start_time ASC"
                 cursor = conn.execute(query, params)
-                return [self._row_to_meeting_sqlite(row) for row in cursor.fetchall()]
+                return [
+                    self._conflict_from_row(
+                        row['id'], row['title'],
+                        datetime.fromisoformat(row['start_time']),
+                        datetime.fromisoformat(row['end_time']) if row['end_time'] else None,
+                        row['status']
+                    )
+                    for row in cursor.fetchall()
+                ]
+
+    def update_status(self, meeting_id: int, status: str, expected: Optional[str] = None) -> bool:
+        """
+        Update meeting status.
+
+        Args:
+            meeting_id: Meeting to update
+            status: New status
+            expected: Only update if the current status is this (atomic claim)
 
-    def update_status(self, meeting_id: int, status: str):
-        """Update meeting status"""
+        Returns:
+            True if the meeting was updated
+        """
+        query = "UPDATE meetings SET status = %s WHERE id = %s"
+        params = (status, meeting_id)
+        if expected is not None:
+            query += " AND status = %s"
+            params += (expected,)
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor() as cur:
-                    cur.execute("""
-                        UPDATE meetings SET status = %s WHERE id = %s
-                    """, (status, meeting_id))
+                    cur.execute(query, params)
+                    updated = cur.rowcount > 0
                 conn.commit()
         else:
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    UPDATE meetings SET status = ? WHERE id = ?
-                """, (status, meeting_id))
+                updated = conn.execute(query.replace("%s", "?"), params).rowcount > 0
                 conn.commit()
+        return updated
 
     def list_all(self, limit: int = 20) -> List[Meeting]:
         """List all meetings"""
         if self.use_postgres:
-            with self._get_pg_connection() as conn:
+            with self._conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("""
                         SELECT * FROM meetings
@@ -450,6 +831,24 @@ class MeetingCalendar:
             uid=row.get('uid') or ""
         )
 
+    def _conflict_from_row(self, id: int, title: str, start_time: datetime,
+                           end_time: Optional[datetime], status: str) -> Meeting:
+        """Partial Meeting for conflict checks (fields not selected are blank)"""
+        return Meeting(
+            id=id,
+            project="",
+            title=title,
+            start_time=start_time,
+            end_time=end_time,
+            join_url="",
+            platform="",
+            from_address="",
+            to_address="",
+            status=status,
+            message_id="",
+            created_at=None
+        )
+
     def _row_to_meeting_sqlite(self, row: sqlite3.Row) -> Meeting:
         """Convert SQLite row to Meeting object"""
         # Handle uid column which may not exist in older databases
@@ -3,7 +3,9 @@
 IMAP IDLE Monitor for CCPM Meeting Agent
 
 Uses IMAP IDLE command for push-based email notifications instead of polling.
-When new mail arrives, processes it immediately without delay.
+When new mail arrives, processes it immediately without delay. Servers that
+support NOTIFY (RFC 5465) also report new mail in subscribed folders over the
+same connection; servers without IDLE are polled.
 
 Usage:
     # Run the idle monitor
@@ -18,8 +20,10 @@ Usage:
 import imaplib
 import email
 import os
+import re
 import sys
 import time
+import queue
 import signal
 import threading
 from email.utils import parseaddr
@@ -43,8 +47,9 @@ class IdleMonitor:
         email_address: str,
         app_password: str,
         on_invite: Optional[Callable[[MeetingInvite], None]] = None,
-        idle_timeout: int = 29 * 60,  # Gmail requires re-IDLE every 29 min
-        reconnect_delay: int = 5
+        idle_timeout: int = 28 * 60,  # Gmail drops IDLE after 29 min; refresh before
+        reconnect_delay: int = 5,
+        poll_interval: int = 60
     ):
         """
         Initialize IDLE monitor.
@@ -55,27 +60,68 @@ class IdleMonitor:
             on_invite: Callback function called for each new meeting invite
             idle_timeout: Seconds before re-issuing IDLE (Gmail max is 29 min)
             reconnect_delay: Seconds to wait before reconnecting after error
+            poll_interval: Seconds between checks if the server lacks IDLE
         """
         self.email_address = email_address
         self.app_password = app_password
         self.on_invite = on_invite
         self.idle_timeout = idle_timeout
         self.reconnect_delay = reconnect_delay
+        self.poll_interval = poll_interval
 
         self.mail: Optional[imaplib.IMAP4_SSL] = None
         self.running = False
+        # Set by stop(), so waits end at once instead of on their next wake-up
+        self._stop = threading.Event()
         self.last_seen_uid = None
+        # Server capabilities, probed on connect
+        self.has_idle = False
+        self.has_notify = False
+        # Other folders with new mail (from NOTIFY STATUS), and last UID seen in each
+        self._notified_folders: List[str] = []
+        self._folder_uids: dict = {}
 
         # Use InboxMonitor for parsing logic
         self._parser = InboxMonitor(email_address, app_password)
 
+        # Invites are handed to a worker thread so slow callbacks (DB, SMTP)
+        # never stall the IDLE connection; when full, new invites are dropped
+        self._invites: queue.Queue = queue.Queue(maxsize=1000)
+        self._queue_warned = False
+        self._worker = threading.Thread(target=self._invite_worker, name="invites", daemon=True)
+        self._worker.start()
+
     def connect(self) -> bool:
         """Establish IMAP connection"""
         try:
             self.mail = imaplib.IMAP4_SSL("imap.gmail.com", 993)
             self.mail.login(self.email_address, self.app_password)
             self.mail.select("INBOX")
-            print(f"✅ IDLE Monitor connected as {self.email_address}")
+            # Capabilities can change after login, so ask again
+            _, caps = self.mail.capability()
+            caps = caps[0].decode().upper().split() if caps and caps[0] else []
+            self.has_idle = "IDLE" in caps
+            self.has_notify = "NOTIFY" in caps
+            if self.has_notify:
+                # New mail in the selected folder arrives as EXISTS, other
+                # subscribed folders report via untagged STATUS responses.
+                # STATUS also reports each folder's UIDNEXT right away, which
+                # seeds the per-folder watermarks
+                try:
+                    typ, data = self.mail.xatom(
+                        "NOTIFY",
+                        "SET STATUS (selected (MessageNew MessageExpunge))"
+                        " (subscribed (MessageNew MessageExpunge FlagChange))"
+                    )
+                except imaplib.IMAP4.error as e:
+                    typ, data = "BAD", [str(e)]
+                if typ == "OK":
+                    self._seed_folder_uids()
+                else:
+                    print(f"⚠️  NOTIFY rejected ({data[0]}), using plain IDLE")
+                    self.has_notify = False
+            mode = "NOTIFY" if self.has_notify else "IDLE" if self.has_idle else f"polling every {self.poll_interval}s"
+            print(f"✅ IDLE Monitor connected as {self.email_address} ({mode})")
             return True
         except imaplib.IMAP4.error as e:
             print(f"❌ IMAP login failed: {e}")
@@ -116,12 +162,7 @@ class IdleMonitor:
 
             # If we have a since_uid, only process messages after it
             if since_uid:
-                try:
-                    since_idx = uids.index(since_uid)
-                    uids = uids[since_idx + 1:]
-                except ValueError:
-                    # since_uid not found, process all recent
-                    pass
+                uids = [uid for uid in uids if int(uid) > int(since_uid)]
 
             for uid in uids:
                 self._process_message(uid)
@@ -176,14 +217,104 @@ class IdleMonitor:
                 f"{invite.location} {invite.description}"
             )
 
-            # Call the callback
+            # Queue for the callback
             if self.on_invite:
                 print(f"📬 New invite: [{invite.method}] {invite.title}")
-                self.on_invite(invite)
+                self._dispatch(invite)
 
         except Exception as e:
             print(f"❌ Error processing message {uid}: {e}")
 
+    def queue_usage_pct(self) -> float:
+        """How full the invite queue is, in percent"""
+        return 100.0 * self._invites.qsize() / self._invites.maxsize
+
+    def _dispatch(self, invite: MeetingInvite):
+        """Queue an invite for the worker without blocking"""
+        try:
+            self._invites.put_nowait(invite)
+        except queue.Full:
+            print(f"❌ Invite queue full, dropping: {invite.title}")
+            return
+        usage = self.queue_usage_pct()
+        if usage >= 50 and not self._queue_warned:
+            print(f"⚠️  Invite queue {usage:.0f}% full, callback is falling behind")
+        self._queue_warned = usage >= 50
+
+    def _invite_worker(self):
+        """Run the callback for each queued invite (None stops the worker)"""
+        while True:
+            invite = self._invites.get()
+            try:
+                if invite is None:
+                    return
+                self.on_invite(invite)
+            except Exception as e:
+                print(f"❌ Error handling invite {invite.title}: {e}")
+            finally:
+                self._invites.task_done()
+
+    def drain(self):
+        """Wait for queued invites to be handled and stop the worker"""
+        if self._worker.is_alive():
+            self._invites.put(None)
+            self._worker.join()
+
+    def _status_folder(self, line: str) -> Optional[str]:
+        """Folder name from an untagged '* STATUS <folder> (...)' response"""
+        rest = line[len('* STATUS'):].strip()
+        if rest.startswith('"'):
+            end = rest.find('"', 1)
+            return rest[1:end] if end > 0 else None
+        return rest.split(' ', 1)[0] or None
+
+    def _status_uidnext(self, line: str) -> Optional[int]:
+        """UIDNEXT from a STATUS response, if present"""
+        match = re.search(r'UIDNEXT (\d+)', line)
+        return int(match.group(1)) if match else None
+
+    def _seed_folder_uids(self):
+        """Start each notified folder's watermark at its current last UID"""
+        _, data = self.mail.response("STATUS")
+        for item in data or []:
+            if not item:
+                continue
+            line = f"* STATUS {item.decode('utf-8', errors='ignore')}"
+            folder = self._status_folder(line)
+            uidnext = self._status_uidnext(line)
+            # Keep watermarks from before a reconnect so missed mail is processed
+            if folder and uidnext:
+                self._folder_uids.setdefault(folder, str(uidnext - 1).encode())
+
+    def _process_notified_folders(self):
+        """Process new mail in folders reported by NOTIFY, then reselect INBOX"""
+        if not self._notified_folders:
+            return
+        folders, self._notified_folders = list(dict.fromkeys(self._notified_folders)), []
+        for folder in folders:
+            try:
+                self.mail.select(f'"{folder}"', readonly=True)
+                since_uid = self._folder_uids.get(folder)
+                inbox_uid = self.last_seen_uid
+                self.last_seen_uid = since_uid
+                self._process_new_messages(since_uid)
+                self._folder_uids[folder] = self.last_seen_uid
+                self.last_seen_uid = inbox_uid
+            except Exception as e:
+                print(f"❌ Error processing {folder}: {e}")
+        self.mail.select("INBOX")
+
+    def _poll_loop(self):
+        """Fallback for servers without IDLE: check for new mail periodically"""
+        print(f"👂 Polling for new mail every {self.poll_interval}s...")
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.mail.noop()
+                self._process_new_messages(self.last_seen_uid)
+            except Exception as e:
+                print(f"❌ Poll error: {e}")
+                return
+
     def _idle_loop(self):
         """
         Main IDLE loop. Issues IDLE command and waits for notifications.
@@ -219,6 +350,19 @@ class IdleMonitor:
                             # Exit IDLE to process
                             break
 
+                        # NOTIFY: new mail in another subscribed folder
+                        if line_str.startswith('* STATUS'):
+                            folder = self._status_folder(line_str)
+                            if folder and folder.upper() != "INBOX":
+                                print(f"📨 New mail in {folder}")
+                                uidnext = self._status_uidnext(line_str)
+                                if folder not in self._folder_uids and uidnext:
+                                    # Not seeded (e.g. subscribed since connect):
+                                    # take only the newest message, not the whole window
+                                    self._folder_uids[folder] = str(uidnext - 2).encode()
+                                self._notified_folders.append(folder)
+                                break
+
                         # Check for tagged response (IDLE ended)
                         if line_str.startswith(tag):
                             break
@@ -240,6 +384,7 @@ class IdleMonitor:
 
                 # Process any new messages
                 self._process_new_messages(self.last_seen_uid)
+                self._process_notified_folders()
 
             except Exception as e:
                 print(f"❌ IDLE loop error: {e}")
@@ -255,6 +400,7 @@ class IdleMonitor:
         Start the IDLE monitor. Blocks until stop() is called.
         """
         self.running = True
+        self._stop.clear()
 
         # Handle signals for graceful shutdown
         def signal_handler(sig, frame):
@@ -283,8 +429,11 @@ class IdleMonitor:
             # Process any messages that arrived while we were disconnected
             # (only on first connect, subsequent reconnects use last_seen_uid)
 
-            # Enter IDLE loop
-            self._idle_loop()
+            # Enter IDLE loop (NOTIFY events also arrive while idling)
+            if self.has_idle:
+                self._idle_loop()
+            else:
+                self._poll_loop()
 
             # If we're still running, we got disconnected - will reconnect
             if self.running:
@@ -293,11 +442,13 @@ class IdleMonitor:
                 time.sleep(self.reconnect_delay)
 
         self.disconnect()
+        self.drain()
         print("IDLE Monitor stopped.")
 
     def stop(self):
         """Stop the IDLE monitor"""
         self.running = False
+        self._stop.set()
         # Break out of IDLE by closing socket
         if self.mail:
             try:
@@ -347,6 +498,7 @@ def main():
             print("Processing recent messages...")
             monitor._process_new_messages()
             monitor.disconnect()
+            monitor.drain()
             print("Done.")
     else:
         # Run the IDLE monitor
@@ -25,7 +25,7 @@ import argparse
 from email.utils import parseaddr
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Generator
+from typing import Optional, Generator, Set
 
 # Optional: icalendar for parsing ICS
 try:
@@ -52,6 +52,7 @@ class MeetingInvite:
         self.raw_ics: str = ""
         self.message_id: str = ""
         self.uid: str = ""  # iCalendar UID for RSVP responses
+        self.imap_uid: int = 0  # IMAP UID of the source message (per folder)
         self.method: str = "REQUEST"  # ICS method: REQUEST, CANCEL, REPLY
 
     def to_dict(self) -> dict:
@@ -90,9 +91,21 @@ class InboxMonitor:
         self.app_password = app_password
         self.domain = domain
         self.mail: Optional[imaplib.IMAP4_SSL] = None
+        # Folder state from the last fetch_invites() call, for UID watermarks
+        self.uidvalidity: Optional[int] = None
+        self.last_uid: int = 0
+        # Kept open between fetches (see connect(persistent=True))
+        self.persistent = False
 
-    def connect(self) -> bool:
-        """Connect to Gmail IMAP"""
+    def connect(self, persistent: bool = False) -> bool:
+        """
+        Connect to Gmail IMAP.
+
+        Args:
+            persistent: Keep the session for reuse across syncs; check it
+                with is_alive() and reconnect() instead of reconnecting per sync
+        """
+        self.persistent = persistent
         try:
             self.mail = imaplib.IMAP4_SSL("imap.gmail.com", 993)
             self.mail.login(self.email_address, self.app_password)
@@ -114,6 +127,21 @@ class InboxMonitor:
                 self.mail.logout()
             except:
                 pass
+            self.mail = None
+
+    def is_alive(self) -> bool:
+        """NOOP the session; also keeps it from hitting the server's idle timeout"""
+        if not self.mail:
+            return False
+        try:
+            return self.mail.noop()[0] == "OK"
+        except:
+            return False
+
+    def reconnect(self) -> bool:
+        """Drop the session and log in again"""
+        self.disconnect()
+        return self.connect(persistent=self.persistent)
 
     def _extract_project_from_address(self, to_address: str) -> str:
         """Extract project name from To: address
@@ -146,6 +174,31 @@ class InboxMonitor:
 
         return ""
 
+    def _scan_cancel(self, ics_data: bytes, result: dict) -> bool:
+        """If the ICS is a METHOD:CANCEL, fill in uid/title/method by line scan.
+
+        Returns False (leaving result untouched) for anything else.
+        """
+        import re
+
+        # Unfold continuation lines (RFC 5545 3.1) so long UIDs stay whole
+        text = ics_data.replace(b"\r\n", b"\n").replace(b"\n ", b"").replace(b"\n\t", b"")
+        method = re.search(rb'^METHOD(?:;[^:\n]*)?:(.*)$', text, re.M)
+        if not method or method.group(1).strip().upper() != b"CANCEL":
+            return False
+
+        def field(name: bytes) -> str:
+            match = re.search(rb'^' + name + rb'(?:;[^:\n]*)?:(.*)$', text, re.M)
+            if not match:
+                return ""
+            value = match.group(1).strip().decode("utf-8", errors="ignore")
+            return re.sub(r'\\([\\;,nN])', lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+        result["method"] = "CANCEL"
+        result["uid"] = field(b"UID")
+        result["title"] = field(b"SUMMARY")
+        return True
+
     def _parse_ics(self, ics_data: bytes) -> dict:
         """Parse ICS calendar data"""
         result = {
@@ -158,6 +211,10 @@ class InboxMonitor:
             "method": "REQUEST",  # Default to REQUEST
         }
 
+        # Cancellations only need UID and SUMMARY: skip the full parse
+        if self._scan_cancel(ics_data, result):
+            return result
+
         if not HAS_ICALENDAR:
             # Fallback: basic regex parsing
             ics_text = ics_data.decode("utf-8", errors="ignore")
@@ -223,26 +280,89 @@ class InboxMonitor:
 
         return result
 
-    def fetch_invites(self, folder: str = "INBOX", unread_only: bool = False, days_back: int = 7) -> Generator[MeetingInvite, None, None]:
-        """Fetch meeting invites from inbox"""
+    def _known_uids(self, uids: list, message_ids: Set[str]) -> Set[int]:
+        """UIDs of messages whose Message-ID is in message_ids (headers only)"""
+        import re
+
+        known = set()
+        for i in range(0, len(uids), 500):
+            _, data = self.mail.uid(
+                'fetch', b",".join(uids[i:i + 500]), "(BODY.PEEK[HEADER.FIELDS (MESSAGE-ID)])"
+            )
+            for item in data:
+                if not isinstance(item, tuple):
+                    continue
+                uid = re.search(rb'UID (\d+)', item[0])
+                message_id = email.message_from_bytes(item[1]).get("Message-ID", "")
+                if uid and message_id in message_ids:
+                    known.add(int(uid.group(1)))
+        return known
+
+    def fetch_invites(
+        self,
+        folder: str = "INBOX",
+        unread_only: bool = False,
+        days_back: int = 7,
+        since_uid: Optional[int] = None,
+        uidvalidity: Optional[int] = None,
+        skip_message_ids: Optional[Set[str]] = None,
+    ) -> Generator[MeetingInvite, None, None]:
+        """Fetch meeting invites from inbox
+
+        If since_uid is given and uidvalidity matches the folder's current
+        UIDVALIDITY, only messages with a higher UID are scanned. Otherwise
+        falls back to the days_back window. After iterating, self.uidvalidity
+        and self.last_uid hold the watermark to persist for the next call.
+
+        Messages whose Message-ID is in skip_message_ids (already stored)
+        are skipped after a header-only fetch, without downloading them.
+        """
         if not self.mail:
             raise RuntimeError("Not connected. Call connect() first.")
 
         self.mail.select(folder)
-
-        # Search for recent emails (much faster than scanning all)
-        from datetime import timedelta
-        since_date = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
+        _, validity = self.mail.response("UIDVALIDITY")
+        self.uidvalidity = int(validity[0]) if validity and validity[0] else None
+        _, uidnext = self.mail.response("UIDNEXT")
+        seed_uid = 0
+
+        if since_uid is not None and uidvalidity is not None and uidvalidity == self.uidvalidity:
+            # Incremental: only messages newer than the stored watermark
+            self.last_uid = since_uid
+            search_criteria = f'UID {since_uid + 1}:*'
+        else:
+            # Search for recent emails (much faster than scanning all)
+            from datetime import timedelta
+            self.last_uid = 0
+            # Once the window is scanned, older mail is done with: the next
+            # sync starts after the folder's newest UID, even if the window
+            # was empty (never from 0, which would rescan the whole folder)
+            seed_uid = int(uidnext[0]) - 1 if uidnext and uidnext[0] else 0
+            since_date = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
+            search_criteria = f'SINCE {since_date}'
 
         if unread_only:
-            search_criteria = f'(UNSEEN SINCE {since_date})'
+            search_criteria = f'(UNSEEN {search_criteria})'
         else:
-            search_criteria = f'(SINCE {since_date})'
+            search_criteria = f'({search_criteria})'
 
-        _, message_numbers = self.mail.search(None, search_criteria)
+        _, uid_data = self.mail.uid('search', None, search_criteria)
+        uids = uid_data[0].split()
+        known = self._known_uids(uids, skip_message_ids) if skip_message_ids else set()
 
-        for num in message_numbers[0].split():
-            _, data = self.mail.fetch(num, "(RFC822)")
+        for uid_bytes in uids:
+            uid = int(uid_bytes)
+            # "UID n:*" always matches the newest message, even if its UID < n
+            if uid <= self.last_uid:
+                continue
+            if uid in known:
+                self.last_uid = uid
+                continue
+
+            _, data = self.mail.uid('fetch', uid_bytes, "(RFC822)")
+            if not data or not data[0]:
+                self.last_uid = uid
+                continue
             raw_email = data[0][1]
             msg = email.message_from_bytes(raw_email)
 
@@ -267,10 +387,12 @@ class InboxMonitor:
                     break
 
             if not has_ics:
+                self.last_uid = uid
                 continue
 
             # Parse the invite
             invite = MeetingInvite()
+            invite.imap_uid = uid
             invite.message_id = msg.get("Message-ID", "")
             invite.subject = msg.get("Subject", "")
             invite.from_address = parseaddr(msg.get("From", ""))[1]
@@ -294,6 +416,9 @@ class InboxMonitor:
                 )
 
             yield invite
+            self.last_uid = uid
+
+        self.last_uid = max(self.last_uid, seed_uid)
 
     def list_invites(self, limit: int = 10) -> list[MeetingInvite]:
         """List recent meeting invites"""
@@ -7,12 +7,17 @@ Uses Gmail's SMTP server with App Passwords for authentication.
 """
 
 import smtplib
+import socket
+import ssl
 import os
+import threading
+import uuid
+from io import BytesIO
+from email import policy
+from email.generator import BytesGenerator
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from icalendar import Calendar, Event
@@ -20,6 +25,102 @@ from icalendar import Calendar, Event
 from monitor import MeetingInvite
 
 
+# Pre-rendered RSVP messages for the common case where every field is
+# printable ASCII: only the per-invite values get %-substituted into the
+# wire bytes. Anything else (RFC 2047 subjects, non-ASCII ICS text) goes
+# through the icalendar/email path in RSVPSender._build_message.
+_BOUNDARY = f"===============ccpm-{uuid.uuid4().hex}=="
+
+_TEMPLATE = (
+    f'Content-Type: multipart/mixed; boundary="{_BOUNDARY}"\r\n'
+    'MIME-Version: 1.0\r\n'
+    'From: %b\r\n'
+    'To: %b\r\n'
+    'Subject: {Status}: %b\r\n'
+    '\r\n'
+    f'--{_BOUNDARY}\r\n'
+    'Content-Type: text/plain; charset="us-ascii"\r\n'
+    'MIME-Version: 1.0\r\n'
+    'Content-Transfer-Encoding: 7bit\r\n'
+    '\r\n'
+    'CCPM Meeting Bot has {status} this meeting invitation.\r\n'
+    '\r\n'
+    'Meeting: %b\r\n'
+    '%b'  # Time line
+    '%b'  # Reason block
+    '\r\n'
+    '---\r\n'
+    'This is an automated response from the CCPM Meeting Bot.\r\n'
+    f'--{_BOUNDARY}\r\n'
+    'Content-Type: text/calendar; charset="utf-8"; method="REPLY"\r\n'
+    'MIME-Version: 1.0\r\n'
+    'Content-Transfer-Encoding: 7bit\r\n'
+    'Content-Disposition: attachment; filename="response.ics"\r\n'
+    '\r\n'
+    'BEGIN:VCALENDAR\r\n'
+    'VERSION:2.0\r\n'
+    'PRODID:-//CCPM Meeting Bot//EN\r\n'
+    'METHOD:REPLY\r\n'
+    'BEGIN:VEVENT\r\n'
+    '%b%b%b%b%b%b%b'  # SUMMARY, DTSTART, DTEND, DTSTAMP, UID, ORGANIZER, ATTENDEE
+    'END:VEVENT\r\n'
+    'END:VCALENDAR\r\n'
+    f'--{_BOUNDARY}--\r\n'
+)
+_TEMPLATE_ACCEPT = _TEMPLATE.replace('{Status}', 'Accepted').replace('{status}', 'accepted').encode('ascii')
+_TEMPLATE_DECLINE = _TEMPLATE.replace('{Status}', 'Declined').replace('{status}', 'declined').encode('ascii')
+
+# RFC 5322 hard line limit, less the longest fixed prefix
+_MAX_FIELD_LEN = 998 - len("Subject: Declined: ")
+
+
+def _ics_text(value: str) -> str:
+    """Escape an iCalendar TEXT value (RFC 5545 3.3.11)."""
+    return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+
+
+def _ics_line(line: str) -> bytes:
+    """Fold an ASCII content line to 75 octets (RFC 5545 3.1)."""
+    if len(line) <= 75:
+        return line.encode('ascii') + b'\r\n'
+    parts = [line[:75]]
+    parts.extend(line[i:i + 74] for i in range(75, len(line), 74))
+    return '\r\n '.join(parts).encode('ascii') + b'\r\n'
+
+
+def _ics_datetime(dt: datetime) -> str:
+    """Format a DATE-TIME value: UTC if tz-aware, floating otherwise."""
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return dt.strftime('%Y%m%dT%H%M%S')
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """SSLContext that offers the last TLS session for resumption."""
+
+    session: Optional[ssl.SSLSession] = None
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        if self.session is not None:
+            kwargs.setdefault("session", self.session)
+        return super().wrap_socket(sock, *args, **kwargs)
+
+
+class _CachedAddressSMTP(smtplib.SMTP):
+    """SMTP client that dials a pre-resolved address.
+
+    The hostname is still passed to smtplib so STARTTLS verifies the
+    certificate against it; only the DNS lookup is skipped.
+    """
+
+    def __init__(self, host: str, port: int, sockaddr: tuple):
+        self._sockaddr = sockaddr
+        super().__init__(host, port)
+
+    def _get_socket(self, host, port, timeout):
+        return socket.create_connection(self._sockaddr[:2], timeout, self.source_address)
+
+
 class RSVPSender:
     """Send iCalendar RSVP responses via SMTP."""
 
@@ -38,6 +139,158 @@ class RSVPSender:
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
 
+        # Reused across sends: resolved SMTP address and TLS session state
+        self._sockaddr: Optional[tuple] = None
+        self._ssl_ctx = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self._ssl_ctx.load_default_certs()
+
+        # Persistent SMTP session, opened lazily and shared by all sends
+        self._server: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _smtp_sockaddr(self) -> tuple:
+        """Resolve the SMTP host once and cache the address"""
+        if self._sockaddr is None:
+            self._sockaddr = socket.getaddrinfo(
+                self.smtp_host, self.smtp_port, type=socket.SOCK_STREAM
+            )[0][4]
+        return self._sockaddr
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP session"""
+        server = _CachedAddressSMTP(self.smtp_host, self.smtp_port, self._smtp_sockaddr())
+        try:
+            server.starttls(context=self._ssl_ctx)
+            server.login(self.email, self.app_password)
+        except Exception:
+            server.close()
+            raise
+        # Keep the session so the next connection can resume it
+        self._ssl_ctx.session = server.sock.session
+        return server
+
+    def _send_message(self, to_address: str, body: bytes):
+        """Send over the persistent session, reconnecting once if it was dropped"""
+        with self._lock:
+            if self._server is not None:
+                try:
+                    self._server.sendmail(self.email, [to_address], body)
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    pass
+                except smtplib.SMTPResponseException as e:
+                    if e.smtp_code != 421:  # 421 = server closing the session
+                        raise
+                self._server = None
+
+            self._server = self._connect()
+            self._server.sendmail(self.email, [to_address], body)
+
+    def close(self):
+        """Close the persistent SMTP session"""
+        with self._lock:
+            if self._server is not None:
+                try:
+                    self._server.quit()
+                except Exception:
+                    self._server.close()
+                self._server = None
+
+    def _render_message(self, invite: MeetingInvite, accepted: bool, reason: str) -> Optional[bytes]:
+        """
+        Render the RSVP email from the pre-built templates.
+
+        Returns:
+            Wire bytes, or None if a field isn't printable ASCII and the
+            message has to go through _build_message instead
+        """
+        time_text = invite.start_time.strftime('%Y-%m-%d %H:%M %Z') if invite.start_time else ""
+        for field in (self.email, invite.from_address, invite.to_address,
+                      invite.title, invite.uid, reason, time_text):
+            if not (field.isascii() and field.isprintable()) or len(field) > _MAX_FIELD_LEN:
+                return None
+
+        partstat = 'ACCEPTED' if accepted else 'DECLINED'
+        template = _TEMPLATE_ACCEPT if accepted else _TEMPLATE_DECLINE
+        return template % (
+            self.email.encode('ascii'),
+            invite.from_address.encode('ascii'),
+            invite.title.encode('ascii'),
+            invite.title.encode('ascii'),
+            f"Time: {time_text}\r\n".encode('ascii') if time_text else b"",
+            f"\r\nReason: {reason}\r\n".encode('ascii') if reason else b"",
+            _ics_line(f"SUMMARY:{_ics_text(invite.title)}"),
+            _ics_line(f"DTSTART:{_ics_datetime(invite.start_time)}") if invite.start_time else b"",
+            _ics_line(f"DTEND:{_ics_datetime(invite.end_time)}") if invite.end_time else b"",
+            _ics_line(f"DTSTAMP:{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"),
+            _ics_line(f"UID:{_ics_text(invite.uid)}"),
+            _ics_line(f"ORGANIZER:mailto:{invite.from_address}"),
+            _ics_line(f'ATTENDEE;CN="CCPM Meeting Bot";PARTSTAT={partstat}:mailto:{invite.to_address}'),
+        )
+
+    def _build_message(self, invite: MeetingInvite, accepted: bool, reason: str) -> bytes:
+        """Build the RSVP email (text body + iCalendar REPLY) as wire bytes"""
+        # Create iCalendar REPLY
+        cal = Calendar()
+        cal.add('prodid', '-//CCPM Meeting Bot//EN')
+        cal.add('version', '2.0')
+        cal.add('method', 'REPLY')
+
+        event = Event()
+        event.add('uid', invite.uid)  # Must match original invite UID
+        event.add('dtstamp', datetime.utcnow())
+
+        if invite.start_time:
+            event.add('dtstart', invite.start_time)
+        if invite.end_time:
+            event.add('dtend', invite.end_time)
+
+        event.add('summary', invite.title)
+        event.add('organizer', f'mailto:{invite.from_address}')
+
+        # PARTSTAT: ACCEPTED, DECLINED, or TENTATIVE
+        partstat = 'ACCEPTED' if accepted else 'DECLINED'
+        event.add('attendee', f'mailto:{invite.to_address}',
+                  parameters={'partstat': partstat, 'cn': 'CCPM Meeting Bot'})
+
+        cal.add_component(event)
+
+        # Create email message
+        msg = MIMEMultipart('mixed', policy=policy.SMTP)
+        msg['From'] = self.email
+        msg['To'] = invite.from_address
+        msg['Subject'] = f"{'Accepted' if accepted else 'Declined'}: {invite.title}"
+
+        # Text body
+        status_text = 'accepted' if accepted else 'declined'
+        body = f"CCPM Meeting Bot has {status_text} this meeting invitation.\n"
+        body += f"\nMeeting: {invite.title}\n"
+        if invite.start_time:
+            body += f"Time: {invite.start_time.strftime('%Y-%m-%d %H:%M %Z')}\n"
+        if reason:
+            body += f"\nReason: {reason}\n"
+        body += "\n---\nThis is an automated response from the CCPM Meeting Bot."
+
+        msg.attach(MIMEText(body, 'plain'))
+
+        # iCalendar attachment with correct content type for REPLY.
+        # ASCII-only ICS fits SMTP's 7bit rules, so skip base64 for it.
+        ics_content = cal.to_ical().decode('utf-8')
+        if ics_content.isascii():
+            ics_part = MIMEText(ics_content, 'calendar', 'us-ascii')
+            ics_part.set_param('charset', 'utf-8')
+        else:
+            ics_part = MIMEText(ics_content, 'calendar', 'utf-8')
+        ics_part.set_param('method', 'REPLY')
+        ics_part.add_header('Content-Disposition', 'attachment', filename='response.ics')
+        msg.attach(ics_part)
+
+        # Serialize once with the SMTP policy (CRLF line endings) so the
+        # bytes can go straight to sendmail without another MIME walk
+        buf = BytesIO()
+        BytesGenerator(buf, policy=policy.SMTP).flatten(msg)
+        return buf.getvalue()
+
     def send_rsvp(self, invite: MeetingInvite, accepted: bool, reason: str = "") -> bool:
         """
         Send RSVP response to meeting organizer.
@@ -58,63 +311,14 @@ class RSVPSender:
             print(f"⚠️  Cannot send RSVP: No organizer address for '{invite.title}'")
             return False
 
+        status_text = 'accepted' if accepted else 'declined'
+
         try:
-            # Create iCalendar REPLY
-            cal = Calendar()
-            cal.add('prodid', '-//CCPM Meeting Bot//EN')
-            cal.add('version', '2.0')
-            cal.add('method', 'REPLY')
-
-            event = Event()
-            event.add('uid', invite.uid)  # Must match original invite UID
-            event.add('dtstamp', datetime.utcnow())
-
-            if invite.start_time:
-                event.add('dtstart', invite.start_time)
-            if invite.end_time:
-                event.add('dtend', invite.end_time)
-
-            event.add('summary', invite.title)
-            event.add('organizer', f'mailto:{invite.from_address}')
-
-            # PARTSTAT: ACCEPTED, DECLINED, or TENTATIVE
-            partstat = 'ACCEPTED' if accepted else 'DECLINED'
-            event.add('attendee', f'mailto:{invite.to_address}',
-                      parameters={'partstat': partstat, 'cn': 'CCPM Meeting Bot'})
-
-            cal.add_component(event)
-
-            # Create email message
-            msg = MIMEMultipart('mixed')
-            msg['From'] = self.email
-            msg['To'] = invite.from_address
-            msg['Subject'] = f"{'Accepted' if accepted else 'Declined'}: {invite.title}"
-
-            # Text body
-            status_text = 'accepted' if accepted else 'declined'
-            body = f"CCPM Meeting Bot has {status_text} this meeting invitation.\n"
-            body += f"\nMeeting: {invite.title}\n"
-            if invite.start_time:
-                body += f"Time: {invite.start_time.strftime('%Y-%m-%d %H:%M %Z')}\n"
-            if reason:
-                body += f"\nReason: {reason}\n"
-            body += "\n---\nThis is an automated response from the CCPM Meeting Bot."
-
-            msg.attach(MIMEText(body, 'plain'))
-
-            # iCalendar attachment with correct content type for REPLY
-            ics_content = cal.to_ical()
-            ics_part = MIMEBase('text', 'calendar', method='REPLY')
-            ics_part.set_payload(ics_content)
-            encoders.encode_base64(ics_part)
-            ics_part.add_header('Content-Disposition', 'attachment', filename='response.ics')
-            msg.attach(ics_part)
+            message = (self._render_message(invite, accepted, reason)
+                       or self._build_message(invite, accepted, reason))
 
             # Send via SMTP
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email, self.app_password)
-                server.send_message(msg)
+            self._send_message(invite.from_address, message)
 
             status_emoji = "✅" if accepted else "❌"
             print(f"{status_emoji} RSVP sent: {status_text.capitalize()} '{invite.title}' to {invite.from_address}")
@@ -123,9 +327,17 @@ class RSVPSender:
         except smtplib.SMTPAuthenticationError as e:
             print(f"❌ SMTP auth failed: {e}")
             print("   Check your Gmail App Password")
+            self.close()
             return False
         except smtplib.SMTPException as e:
             print(f"❌ SMTP error sending RSVP: {e}")
+            self.close()
+            return False
+        except OSError as e:
+            # Connection-level failure: re-resolve the host on the next send
+            self._sockaddr = None
+            self.close()
+            print(f"❌ Failed to connect to SMTP server: {e}")
             return False
         except Exception as e:
             print(f"❌ Failed to send RSVP: {e}")
@@ -168,6 +380,7 @@ def main():
 
         rsvp = RSVPSender(email, app_password)
         success = rsvp.accept(invite)
+        rsvp.close()
         print(f"Test RSVP {'succeeded' if success else 'failed'}")
     else:
         parser.print_help()
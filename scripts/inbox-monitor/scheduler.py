@@ -37,6 +37,14 @@ class MeetingScheduler:
         self.poll_interval = poll_interval
         self.join_before_minutes = join_before_minutes
         self.running = False
+        # Resolve the local timezone once; astimezone() re-detects it per call
+        self._tz = datetime.now().astimezone().tzinfo
+        # Message IDs already in the calendar, so known invites are skipped
+        # before building a Meeting or hitting SQLite (e.g. after a UIDVALIDITY reset)
+        self._seen = self.calendar.get_message_ids()
+        # Cached next pending meeting and the last (id, minutes) shown for it
+        self._next_pending = None
+        self._last_display = (None, None)
 
     def sync_inbox(self) -> int:
         """Sync new invites from inbox to calendar. Returns count of new meetings."""
@@ -45,8 +53,17 @@ class MeetingScheduler:
             return 0
 
         new_count = 0
+        meetings = []
+        state = self.calendar.get_sync_state("INBOX")
+        uidvalidity, since_uid = state if state else (None, None)
         try:
-            for invite in self.inbox.fetch_invites(unread_only=False, days_back=14):
+            for invite in self.inbox.fetch_invites(
+                unread_only=False,
+                days_back=14,
+                since_uid=since_uid,
+                uidvalidity=uidvalidity,
+                skip_message_ids=self._seen,
+            ):
                 # Skip if no join URL
                 if not invite.join_url:
                     continue
@@ -55,6 +72,10 @@ class MeetingScheduler:
                 if not invite.start_time:
                     continue
 
+                # Skip invites already stored
+                if invite.message_id and invite.message_id in self._seen:
+                    continue
+
                 # Create meeting from invite
                 meeting = Meeting(
                     id=None,
@@ -68,24 +89,33 @@ class MeetingScheduler:
                     to_address=invite.to_address,
                     status="pending",
                     message_id=invite.message_id,
-                    created_at=datetime.now().astimezone(),
+                    created_at=datetime.now(self._tz),
                     raw_ics=invite.raw_ics
                 )
 
-                # Try to add (will return None if duplicate)
-                meeting_id = self.calendar.add_meeting(meeting)
+                meetings.append(meeting)
+
+            # Insert the whole batch in one transaction (duplicates are skipped)
+            for meeting, meeting_id in zip(meetings, self.calendar.add_meetings(meetings)):
+                if meeting.message_id:
+                    self._seen.add(meeting.message_id)
                 if meeting_id:
                     new_count += 1
                     print(f"📅 Added: {meeting.title} ({meeting.project}) @ {meeting.start_time:%Y-%m-%d %H:%M}")
 
+            # Only advance the watermark once every message up to it was handled;
+            # a 0 watermark would make the next sync fetch the whole mailbox
+            if self.inbox.uidvalidity is not None and self.inbox.last_uid:
+                self.calendar.set_sync_state("INBOX", self.inbox.uidvalidity, self.inbox.last_uid)
+
         finally:
             self.inbox.disconnect()
 
         return new_count
 
-    def check_upcoming(self) -> list[Meeting]:
-        """Check for meetings about to start"""
-        upcoming = self.calendar.get_upcoming(minutes_ahead=self.join_before_minutes + 1)
+    def check_upcoming(self) -> list[tuple[int, str, datetime]]:
+        """Check for meetings about to start. Returns (id, title, start_time) tuples."""
+        upcoming = self.calendar.get_upcoming_lite(minutes_ahead=self.join_before_minutes + 1)
         return upcoming
 
     def trigger_join(self, meeting: Meeting):
@@ -125,19 +155,26 @@ class MeetingScheduler:
 
         # Check for meetings to join
         upcoming = self.check_upcoming()
-        for meeting in upcoming:
-            self.trigger_join(meeting)
-
-        # Show next pending meeting
-        pending = self.calendar.get_all_pending()
-        if pending:
-            next_meeting = pending[0]
-            time_until = next_meeting.start_time - datetime.now().astimezone()
-            mins = int(time_until.total_seconds() / 60)
-            if mins > 0:
-                print(f"   ⏰ Next meeting in {mins} min: {next_meeting.title}")
-            else:
-                print(f"   ⏰ Meeting starting now: {next_meeting.title}")
+        for meeting_id, _, _ in upcoming:
+            # Only load the full row (incl. raw_ics) once we actually join
+            meeting = self.calendar.get(meeting_id)
+            if meeting:
+                self.trigger_join(meeting)
+
+        # Show next pending meeting; only re-query when the calendar changed
+        # or the cached meeting is due, and only print when the minute changes
+        next_pending = self._next_pending
+        if new_meetings or upcoming or next_pending is None or next_pending[2].timestamp() <= time.time():
+            next_pending = self._next_pending = self.calendar.get_next_pending()
+        if next_pending:
+            meeting_id, title, start_time = next_pending
+            mins = int((start_time.timestamp() - time.time()) / 60)
+            if self._last_display != (meeting_id, mins):
+                self._last_display = (meeting_id, mins)
+                if mins > 0:
+                    print(f"   ⏰ Next meeting in {mins} min: {title}")
+                else:
+                    print(f"   ⏰ Meeting starting now: {title}")
 
     def run(self):
         """Run continuous scheduler loop"""
@@ -11,17 +11,128 @@ This is the main service that:
 
 import os
 import sys
+import copy
 import time
+import queue
 import signal
 import argparse
+import logging
+import logging.handlers
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 
 from monitor import InboxMonitor, MeetingInvite
 from calendar_pg import MeetingCalendar, Meeting
 from rsvp import RSVPSender
 from idle_monitor import IdleMonitor
 
+logger = logging.getLogger("scheduler")
+
+
+class _DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops the oldest record instead of blocking when full"""
+
+    def enqueue(self, record):
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except queue.Empty:
+                    pass
+
+
+def _setup_logging() -> logging.handlers.QueueListener:
+    """Log through a bounded queue drained to stdout by a background thread.
+
+    Callers only enqueue, so a slow stdout (container log pipe) never
+    stalls the scheduler loop, the IDLE callback or the join workers.
+    """
+    log_q: queue.Queue = queue.Queue(maxsize=10000)
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_q, stream)
+    logger.addHandler(_DropOldestQueueHandler(log_q))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+# Resolved once; datetime.now().astimezone() re-detects the zone every call
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+# Gmail drops IMAP sessions idle for ~30 min; NOOP well inside that
+_NOOP_INTERVAL = 5 * 60
+
+# meeting-bot Job manifest (raw K8s REST schema, accepted by the client as-is).
+# Per-meeting fields are filled in by _job_manifest().
+_JOB_NAMESPACE = "robert"
+_JOB_TEMPLATE = {
+    "apiVersion": "batch/v1",
+    "kind": "Job",
+    "metadata": {
+        "name": None,
+        "namespace": _JOB_NAMESPACE,
+        "labels": {"app": "meeting-bot"},
+    },
+    "spec": {
+        "ttlSecondsAfterFinished": 3600,  # Clean up after 1 hour
+        "backoffLimit": 0,  # Don't retry
+        "template": {
+            "metadata": {"labels": {"app": "meeting-bot"}},
+            "spec": {
+                "restartPolicy": "Never",
+                "containers": [{
+                    "name": "bot",
+                    "image": "ubuntu.desmana-truck.ts.net:30500/meeting-bot:v3-postgres",
+                    "imagePullPolicy": "Always",
+                    "env": [
+                        {"name": "MEETING_URL", "value": None},
+                        {"name": "PROJECT", "value": None},
+                        {"name": "OUTPUT_DIR", "value": "/app/output"},
+                        {"name": "MEETING_ID", "value": None},
+                        {"name": "DATABASE_URL", "value": None},
+                    ],
+                    "resources": {
+                        "requests": {"memory": "1Gi", "cpu": "1"},
+                        "limits": {"memory": "2Gi", "cpu": "2"},
+                    },
+                    "securityContext": {"capabilities": {"add": ["SYS_ADMIN"]}},
+                    "volumeMounts": [{"name": "dshm", "mountPath": "/dev/shm"}],
+                }],
+                "volumes": [{
+                    "name": "dshm",
+                    "emptyDir": {"medium": "Memory", "sizeLimit": "1Gi"},
+                }],
+            },
+        },
+    },
+}
+
+
+def _job_manifest(meeting: Meeting) -> dict:
+    """Copy the Job template and fill in the per-meeting fields"""
+    job = copy.deepcopy(_JOB_TEMPLATE)
+    job["metadata"]["name"] = f"meeting-bot-{meeting.id}"
+    job["metadata"]["labels"].update({"project": meeting.project, "meeting-id": str(meeting.id)})
+    values = {
+        "MEETING_URL": meeting.join_url,
+        "PROJECT": meeting.project,
+        "MEETING_ID": str(meeting.id),
+        "DATABASE_URL": os.environ.get("DATABASE_URL", ""),
+    }
+    for env in job["spec"]["template"]["spec"]["containers"][0]["env"]:
+        if env["name"] in values:
+            env["value"] = values[env["name"]]
+    return job
+
 
 class MeetingScheduler:
     """Main scheduler service"""
@@ -36,138 +147,241 @@ class MeetingScheduler:
         send_rsvp: bool = True
     ):
         self.inbox = InboxMonitor(email_address, app_password)
+        # One IMAP session for all syncs; sync_inbox() reconnects if it dropped
+        self.inbox.connect(persistent=True)
         self.calendar = MeetingCalendar(database_url)
         self.rsvp = RSVPSender(email_address, app_password) if send_rsvp else None
         self.poll_interval = poll_interval
         self.join_before_minutes = join_before_minutes
         self.send_rsvp = send_rsvp
-        self.running = False
+        # Set to stop run()/run_idle(); loops sleep on it instead of polling a flag
+        self._stop = threading.Event()
+
+        # RSVPs are sent by a single worker thread so SMTP latency never
+        # delays inbox syncs or meeting joins
+        self._rsvp_q: queue.Queue = queue.Queue(maxsize=256)
+        if self.rsvp:
+            threading.Thread(target=self._rsvp_worker, name="rsvp", daemon=True).start()
+
+        # K8s Job creation runs off the main loop; the API client is built once
+        self._join_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="join")
+        self._batch_v1 = None
+        self._k8s_lock = threading.Lock()
+        # Meetings whose Job is being created, so concurrent join checks skip them
+        self._joining: set = set()
+        self._joining_lock = threading.Lock()
 
     def sync_inbox(self) -> int:
         """Sync new invites from inbox to calendar. Returns count of new meetings."""
-        if not self.inbox.connect():
-            print("❌ Failed to connect to inbox")
+        if not self.inbox.is_alive() and not self.inbox.reconnect():
+            logger.error("❌ Failed to connect to inbox")
             return 0
 
         new_count = 0
         cancelled_count = 0
-        try:
-            for invite in self.inbox.fetch_invites(unread_only=False, days_back=14):
-                # Handle cancellations first
-                if invite.method == "CANCEL":
+        items = []  # Invites to store, plus cancellations of invites among them
+        batch_uids = set()
+        # Invites already stored are skipped before they are downloaded;
+        # anything received in the window was stored within it
+        known_ids = self.calendar.get_recent_message_ids(days=14)
+        # Only mail newer than the stored UID watermark is searched; the
+        # 14-day window is the fallback when there is none or UIDVALIDITY changed
+        state = self.calendar.get_sync_state("INBOX")
+        uidvalidity, since_uid = state if state else (None, None)
+        for invite in self.inbox.fetch_invites(unread_only=False, days_back=14,
+                                               since_uid=since_uid, uidvalidity=uidvalidity,
+                                               skip_message_ids=known_ids):
+            # Handle cancellations first; one for an invite in this batch
+            # has to wait until that invite is stored
+            if invite.method == "CANCEL":
+                if invite.uid and invite.uid in batch_uids:
+                    items.append(invite)
+                else:
                     self._handle_cancellation(invite)
-                    cancelled_count += 1
-                    continue
+                cancelled_count += 1
+                continue
+
+            # Skip if no join URL (for new invites)
+            if not invite.join_url:
+                continue
+
+            # Skip if no start time
+            if not invite.start_time:
+                continue
+
+            items.append(invite)
+            if invite.uid:
+                batch_uids.add(invite.uid)
+
+        invites = [i for i in items if i.method != "CANCEL"]
+        if invites:
+            # One query for everything that could overlap the batch; each
+            # invite is then checked in memory, including against invites
+            # accepted earlier in the same batch
+            existing = self.calendar.check_conflicts(
+                min(i.start_time for i in invites),
+                max(i.end_time or i.start_time + timedelta(hours=1) for i in invites)
+            )
+            stored = self.calendar.get_existing_message_ids([i.message_id for i in invites])
+            accepted = []
+            results = []
+            cancels = []
+            now = datetime.now(_LOCAL_TZ)
 
-                # Skip if no join URL (for new invites)
-                if not invite.join_url:
+            for invite in items:
+                if invite.method == "CANCEL":
+                    accepted = [m for m in accepted if m.uid != invite.uid]
+                    cancels.append(invite)
                     continue
 
-                # Skip if no start time
-                if not invite.start_time:
-                    continue
+                meeting, reason, n_conflicts = self._classify_invite(invite, existing + accepted, now)
+                new = meeting.status == "pending" and invite.message_id not in stored
+                results.append((invite, meeting, reason, n_conflicts, new))
+                if new:
+                    accepted.append(meeting)
+                    stored.add(invite.message_id)
+
+            # Insert the whole batch in one transaction (duplicates are skipped)
+            meeting_ids = self.calendar.add_meetings([r[1] for r in results])
+            rejected = []
+            for (invite, meeting, reason, n_conflicts, new), meeting_id in zip(results, meeting_ids):
+                if meeting_id:
+                    self._announce(invite, meeting, reason, n_conflicts)
+                    if meeting.status == "pending":
+                        new_count += 1
+                elif new:
+                    rejected.append(invite)
 
-                # Check if meeting has already ended
-                now = datetime.now().astimezone()
-                if invite.end_time and invite.end_time < now:
-                    # Meeting already ended - record it as missed, don't RSVP
-                    meeting = Meeting(
-                        id=None,
-                        project=invite.project,
-                        title=invite.title,
-                        start_time=invite.start_time,
-                        end_time=invite.end_time,
-                        join_url=invite.join_url,
-                        platform="",
-                        from_address=invite.from_address,
-                        to_address=invite.to_address,
-                        status="missed",
-                        message_id=invite.message_id,
-                        created_at=datetime.now().astimezone(),
-                        raw_ics=invite.raw_ics,
-                        uid=invite.uid
-                    )
-                    meeting_id = self.calendar.add_meeting(meeting)
-                    if meeting_id:
-                        print(f"⏰ Meeting already ended, marking as missed: {invite.title}")
-                    continue
+            for invite in cancels:
+                self._handle_cancellation(invite)
 
-                # Check for conflicts with existing meetings
-                conflicts = self.calendar.check_conflicts(
-                    invite.start_time,
-                    invite.end_time
-                )
-
-                if conflicts:
-                    # Decline with reason listing conflicting meetings
-                    conflict_titles = ", ".join(m.title for m in conflicts[:3])
-                    if len(conflicts) > 3:
-                        conflict_titles += f" (+{len(conflicts) - 3} more)"
-                    reason = f"Scheduling conflict with: {conflict_titles}"
-
-                    # Create meeting record with declined status
-                    meeting = Meeting(
-                        id=None,
-                        project=invite.project,
-                        title=invite.title,
-                        start_time=invite.start_time,
-                        end_time=invite.end_time,
-                        join_url=invite.join_url,
-                        platform="",  # Will be auto-detected
-                        from_address=invite.from_address,
-                        to_address=invite.to_address,
-                        status="declined",
-                        message_id=invite.message_id,
-                        created_at=datetime.now().astimezone(),
-                        raw_ics=invite.raw_ics,
-                        uid=invite.uid
-                    )
-
-                    meeting_id = self.calendar.add_meeting(meeting)
-                    if meeting_id:
-                        print(f"⚠️  Declined: {meeting.title} (conflict with {len(conflicts)} meeting(s))")
-                        # Send decline RSVP
-                        if self.rsvp:
-                            self.rsvp.decline(invite, reason=reason)
-                else:
-                    # No conflicts - accept the meeting
-                    meeting = Meeting(
-                        id=None,
-                        project=invite.project,
-                        title=invite.title,
-                        start_time=invite.start_time,
-                        end_time=invite.end_time,
-                        join_url=invite.join_url,
-                        platform="",  # Will be auto-detected
-                        from_address=invite.from_address,
-                        to_address=invite.to_address,
-                        status="pending",
-                        message_id=invite.message_id,
-                        created_at=datetime.now().astimezone(),
-                        raw_ics=invite.raw_ics,
-                        uid=invite.uid
-                    )
-
-                    meeting_id = self.calendar.add_meeting(meeting)
-                    if meeting_id:
-                        new_count += 1
-                        print(f"📅 Accepted: {meeting.title} ({meeting.project}) @ {meeting.start_time:%Y-%m-%d %H:%M}")
-                        # Send accept RSVP
-                        if self.rsvp:
-                            self.rsvp.accept(invite)
+            # Rejected by meetings_no_overlap: the slot was taken after the
+            # conflict check (e.g. by the IDLE listener). Re-checked only after
+            # this batch's cancellations, which may have freed it again
+            for invite in rejected:
+                logger.warning(f"⚠️  Slot taken while storing {invite.title}, re-checking conflicts")
+                self._ingest_invite(invite)
 
-        finally:
-            self.inbox.disconnect()
+        # Only advance the watermark once every message up to it was handled;
+        # a 0 watermark would make the next sync fetch the whole mailbox
+        if self.inbox.uidvalidity is not None and self.inbox.last_uid:
+            self.calendar.set_sync_state("INBOX", self.inbox.uidvalidity, self.inbox.last_uid)
 
         if cancelled_count > 0:
-            print(f"   🗑️  Processed {cancelled_count} cancellation(s)")
+            logger.info(f"   🗑️  Processed {cancelled_count} cancellation(s)")
 
         return new_count
 
+    def _classify_invite(self, invite: MeetingInvite, candidates: list[Meeting], now: datetime):
+        """
+        Decide what to record for an invite.
+
+        Args:
+            invite: Invite with a join URL and start time
+            candidates: Meetings that may overlap it
+            now: Current time (also used as created_at)
+
+        Returns:
+            (meeting, decline reason or None, number of conflicts)
+        """
+        # Meeting already ended - record it as missed, don't RSVP
+        if invite.end_time and invite.end_time < now:
+            return self._meeting_from_invite(invite, "missed", now), None, 0
+
+        conflicts = [m for m in candidates if m.overlaps(invite.start_time, invite.end_time)]
+        if not conflicts:
+            return self._meeting_from_invite(invite, "pending", now), None, 0
+
+        # Decline with reason listing conflicting meetings
+        conflict_titles = ", ".join(m.title for m in conflicts[:3])
+        if len(conflicts) > 3:
+            conflict_titles += f" (+{len(conflicts) - 3} more)"
+        reason = f"Scheduling conflict with: {conflict_titles}"
+        return self._meeting_from_invite(invite, "declined", now), reason, len(conflicts)
+
+    def _announce(self, invite: MeetingInvite, meeting: Meeting, reason: str, n_conflicts: int):
+        """Log a newly stored meeting and queue its RSVP"""
+        if meeting.status == "missed":
+            logger.info(f"⏰ Meeting already ended, marking as missed: {invite.title}")
+        elif meeting.status == "declined":
+            logger.warning(f"⚠️  Declined: {meeting.title} (conflict with {n_conflicts} meeting(s))")
+            self._queue_rsvp(invite, accepted=False, reason=reason)
+        else:
+            logger.info(f"📅 Accepted: {meeting.title} ({meeting.project}) @ {meeting.start_time:%Y-%m-%d %H:%M}")
+            self._queue_rsvp(invite, accepted=True)
+
+    def _ingest_invite(self, invite: MeetingInvite) -> Optional[int]:
+        """
+        Store a single invite and send its RSVP.
+
+        Returns:
+            ID of the new meeting, or None if it was already stored
+        """
+        now = datetime.now(_LOCAL_TZ)
+        conflicts = []
+        if not (invite.end_time and invite.end_time < now):
+            conflicts = self.calendar.check_conflicts(invite.start_time, invite.end_time)
+        meeting, reason, n_conflicts = self._classify_invite(invite, conflicts, now)
+
+        meeting_id = self.calendar.add_meeting(meeting)
+        if meeting_id:
+            self._announce(invite, meeting, reason, n_conflicts)
+        elif meeting.status == "pending" and self.calendar.check_conflicts(invite.start_time, invite.end_time):
+            # Another thread booked the slot between our check and insert
+            # (rejected by the no-overlap constraint) - decline instead
+            return self._ingest_invite(invite)
+        return meeting_id
+
+    def _meeting_from_invite(self, invite: MeetingInvite, status: str, created_at: datetime) -> Meeting:
+        """Build the calendar record for an invite"""
+        return Meeting(
+            id=None,
+            project=invite.project,
+            title=invite.title,
+            start_time=invite.start_time,
+            end_time=invite.end_time,
+            join_url=invite.join_url,
+            platform="",  # Will be auto-detected
+            from_address=invite.from_address,
+            to_address=invite.to_address,
+            status=status,
+            message_id=invite.message_id,
+            created_at=created_at,
+            raw_ics=invite.raw_ics,
+            uid=invite.uid
+        )
+
+    def _queue_rsvp(self, invite: MeetingInvite, accepted: bool, reason: str = ""):
+        """Hand an RSVP to the background sender (blocks only if the queue is full)"""
+        if self.rsvp:
+            self._rsvp_q.put((invite, accepted, reason))
+
+    def _rsvp_worker(self):
+        """Drain the RSVP queue over the sender's persistent SMTP session"""
+        while True:
+            invite, accepted, reason = self._rsvp_q.get()
+            try:
+                self.rsvp.send_rsvp(invite, accepted, reason=reason)
+            finally:
+                self._rsvp_q.task_done()
+
+    def shutdown(self):
+        """Wait for pending Job creations and RSVPs, then close connections"""
+        self._join_executor.shutdown(wait=True)
+        self.flush_rsvps()
+        self.calendar.close()
+        self.inbox.disconnect()
+
+    def flush_rsvps(self):
+        """Wait for queued RSVPs to be sent, then close the SMTP session"""
+        if self.rsvp:
+            self._rsvp_q.join()
+            self.rsvp.close()
+
     def _handle_cancellation(self, invite: MeetingInvite):
         """Handle a meeting cancellation by updating the existing meeting status."""
         if not invite.uid:
-            print(f"⚠️  Cancellation without UID: {invite.title}")
+            logger.warning(f"⚠️  Cancellation without UID: {invite.title}")
             return
 
         # Find the existing meeting by UID
@@ -175,13 +389,13 @@ class MeetingScheduler:
         if existing:
             if existing.status not in ('cancelled', 'completed'):
                 self.calendar.update_status(existing.id, "cancelled")
-                print(f"🗑️  Cancelled: {existing.title} ({existing.project})")
+                logger.info(f"🗑️  Cancelled: {existing.title} ({existing.project})")
             else:
                 # Already cancelled or completed, skip
                 pass
         else:
             # No matching meeting found - might be for a meeting we declined or never saw
-            print(f"⚠️  Cancellation for unknown meeting: {invite.title} (UID: {invite.uid[:20]}...)")
+            logger.warning(f"⚠️  Cancellation for unknown meeting: {invite.title} (UID: {invite.uid[:20]}...)")
 
     def check_upcoming(self) -> list[Meeting]:
         """Check for meetings about to start"""
@@ -190,110 +404,73 @@ class MeetingScheduler:
 
     def trigger_join(self, meeting: Meeting):
         """Trigger the bot to join a meeting by creating a K8s Job"""
-        print(f"\n{'='*60}")
-        print(f"🚀 TIME TO JOIN MEETING!")
-        print(f"   Project:  {meeting.project}")
-        print(f"   Title:    {meeting.title}")
-        print(f"   Platform: {meeting.platform}")
-        print(f"   URL:      {meeting.join_url}")
-        print(f"{'='*60}\n")
-
-        # Update status to joining
-        self.calendar.update_status(meeting.id, "joining")
-
-        # Spawn meeting-bot K8s Job
-        try:
-            from kubernetes import client, config
+        # Claim the meeting in memory (before handing off, so the next check
+        # doesn't pick it up again); join checks run on several threads
+        with self._joining_lock:
+            if meeting.id in self._joining:
+                return
+            self._joining.add(meeting.id)
+
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🚀 TIME TO JOIN MEETING!")
+        logger.info(f"   Project:  {meeting.project}")
+        logger.info(f"   Title:    {meeting.title}")
+        logger.info(f"   Platform: {meeting.platform}")
+        logger.info(f"   URL:      {meeting.join_url}")
+        logger.info(f"{'='*60}\n")
+
+        # Spawn the Job in the background; the apiserver round-trip
+        # shouldn't delay other meetings starting in the same minute
+        self._join_executor.submit(self._spawn_bot_job, meeting)
+
+    def _k8s_batch_api(self):
+        """Load the K8s config and build the BatchV1Api client once"""
+        with self._k8s_lock:
+            if self._batch_v1 is None:
+                from kubernetes import client, config
+
+                # Load in-cluster config (running inside K8s)
+                try:
+                    config.load_incluster_config()
+                except:
+                    # Fallback for local testing
+                    config.load_kube_config()
 
-            # Load in-cluster config (running inside K8s)
-            try:
-                config.load_incluster_config()
-            except:
-                # Fallback for local testing
-                config.load_kube_config()
-
-            batch_v1 = client.BatchV1Api()
-
-            job_name = f"meeting-bot-{meeting.id}"
-            namespace = "robert"
-
-            job = client.V1Job(
-                api_version="batch/v1",
-                kind="Job",
-                metadata=client.V1ObjectMeta(
-                    name=job_name,
-                    namespace=namespace,
-                    labels={
-                        "app": "meeting-bot",
-                        "project": meeting.project,
-                        "meeting-id": str(meeting.id),
-                    }
-                ),
-                spec=client.V1JobSpec(
-                    ttl_seconds_after_finished=3600,  # Clean up after 1 hour
-                    backoff_limit=0,  # Don't retry
-                    template=client.V1PodTemplateSpec(
-                        metadata=client.V1ObjectMeta(
-                            labels={"app": "meeting-bot"}
-                        ),
-                        spec=client.V1PodSpec(
-                            restart_policy="Never",
-                            containers=[
-                                client.V1Container(
-                                    name="bot",
-                                    image="ubuntu.desmana-truck.ts.net:30500/meeting-bot:v3-postgres",
-                                    image_pull_policy="Always",
-                                    env=[
-                                        client.V1EnvVar(name="MEETING_URL", value=meeting.join_url),
-                                        client.V1EnvVar(name="PROJECT", value=meeting.project),
-                                        client.V1EnvVar(name="OUTPUT_DIR", value="/app/output"),
-                                        client.V1EnvVar(name="MEETING_ID", value=str(meeting.id)),
-                                        client.V1EnvVar(name="DATABASE_URL", value=os.environ.get("DATABASE_URL", "")),
-                                    ],
-                                    resources=client.V1ResourceRequirements(
-                                        requests={"memory": "1Gi", "cpu": "1"},
-                                        limits={"memory": "2Gi", "cpu": "2"}
-                                    ),
-                                    security_context=client.V1SecurityContext(
-                                        capabilities=client.V1Capabilities(add=["SYS_ADMIN"])
-                                    ),
-                                    volume_mounts=[
-                                        client.V1VolumeMount(name="dshm", mount_path="/dev/shm")
-                                    ]
-                                )
-                            ],
-                            volumes=[
-                                client.V1Volume(
-                                    name="dshm",
-                                    empty_dir=client.V1EmptyDirVolumeSource(
-                                        medium="Memory",
-                                        size_limit="1Gi"
-                                    )
-                                )
-                            ]
-                        )
-                    )
-                )
-            )
+                self._batch_v1 = client.BatchV1Api()
+            return self._batch_v1
 
-            batch_v1.create_namespaced_job(namespace=namespace, body=job)
-            print(f"✅ Created K8s Job: {job_name}")
-            self.calendar.update_status(meeting.id, "bot_spawned")
+    def _spawn_bot_job(self, meeting: Meeting):
+        """Create the meeting-bot K8s Job for a meeting"""
+        try:
+            batch_v1 = self._k8s_batch_api()
+            job = _job_manifest(meeting)
+            job_name = job["metadata"]["name"]
+
+            batch_v1.create_namespaced_job(namespace=_JOB_NAMESPACE, body=job)
+            logger.info(f"✅ Created K8s Job: {job_name}")
+            # Single write per join; only a still-pending meeting moves on
+            self.calendar.update_status(meeting.id, "bot_spawned", expected="pending")
 
         except Exception as e:
-            print(f"❌ Failed to create K8s Job: {e}")
-            import traceback
-            traceback.print_exc()
-            self.calendar.update_status(meeting.id, "spawn_failed")
+            if getattr(e, "status", None) == 409:
+                # Job names are per meeting, so another scheduler already spawned it
+                logger.info(f"   Job already exists for meeting {meeting.id}")
+                self.calendar.update_status(meeting.id, "bot_spawned", expected="pending")
+            else:
+                logger.exception(f"❌ Failed to create K8s Job: {e}")
+                self.calendar.update_status(meeting.id, "spawn_failed", expected="pending")
+        finally:
+            with self._joining_lock:
+                self._joining.discard(meeting.id)
 
     def run_once(self):
         """Run one cycle: sync inbox + check upcoming"""
-        print(f"\n[{datetime.now():%H:%M:%S}] Checking...")
+        logger.info(f"\n[{datetime.now():%H:%M:%S}] Checking...")
 
         # Sync inbox
         new_meetings = self.sync_inbox()
         if new_meetings:
-            print(f"   ✅ Added {new_meetings} new meeting(s)")
+            logger.info(f"   ✅ Added {new_meetings} new meeting(s)")
 
         # Check for meetings to join
         upcoming = self.check_upcoming()
@@ -304,50 +481,51 @@ class MeetingScheduler:
         pending = self.calendar.get_all_pending()
         if pending:
             next_meeting = pending[0]
-            time_until = next_meeting.start_time - datetime.now().astimezone()
+            time_until = next_meeting.start_time - datetime.now(_LOCAL_TZ)
             mins = int(time_until.total_seconds() / 60)
             if mins > 0:
-                print(f"   ⏰ Next meeting in {mins} min: {next_meeting.title}")
+                logger.info(f"   ⏰ Next meeting in {mins} min: {next_meeting.title}")
             else:
-                print(f"   ⏰ Meeting starting now: {next_meeting.title}")
+                logger.info(f"   ⏰ Meeting starting now: {next_meeting.title}")
         else:
-            print(f"   📭 No pending meetings")
+            logger.info(f"   📭 No pending meetings")
 
     def run(self):
         """Run continuous scheduler loop"""
-        self.running = True
+        self._stop.clear()
 
         def signal_handler(sig, frame):
-            print("\n\n🛑 Shutting down scheduler...")
-            self.running = False
+            logger.info("\n\n🛑 Shutting down scheduler...")
+            self._stop.set()
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
-        print("="*60)
-        print("🗓️  CCPM Meeting Scheduler Started")
-        print(f"   Database: {'PostgreSQL' if self.calendar.use_postgres else 'SQLite'}")
-        print(f"   Polling every {self.poll_interval} seconds")
-        print(f"   Will join meetings {self.join_before_minutes} min before start")
-        print(f"   Auto RSVP: {'Enabled' if self.send_rsvp else 'Disabled'}")
-        print("   Press Ctrl+C to stop")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("🗓️  CCPM Meeting Scheduler Started")
+        logger.info(f"   Database: {'PostgreSQL' if self.calendar.use_postgres else 'SQLite'}")
+        logger.info(f"   Polling every {self.poll_interval} seconds")
+        logger.info(f"   Will join meetings {self.join_before_minutes} min before start")
+        logger.info(f"   Auto RSVP: {'Enabled' if self.send_rsvp else 'Disabled'}")
+        logger.info("   Press Ctrl+C to stop")
+        logger.info("="*60)
 
-        while self.running:
+        while not self._stop.is_set():
             try:
                 self.run_once()
             except Exception as e:
-                print(f"❌ Error: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"❌ Error: {e}")
 
-            # Wait for next cycle
-            for _ in range(self.poll_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Wait for next cycle (returns early on shutdown), NOOPing the
+            # IMAP session so Gmail doesn't drop it on long intervals
+            remaining = self.poll_interval
+            while remaining > 0 and not self._stop.wait(min(remaining, _NOOP_INTERVAL)):
+                remaining -= _NOOP_INTERVAL
+                if remaining > 0:
+                    self.inbox.is_alive()
 
-        print("Scheduler stopped.")
+        self.shutdown()
+        logger.info("Scheduler stopped.")
 
     def process_invite(self, invite: MeetingInvite):
         """
@@ -361,113 +539,38 @@ class MeetingScheduler:
 
         # Skip if no join URL
         if not invite.join_url:
-            print(f"⚠️  Skipping invite without join URL: {invite.title}")
+            logger.warning(f"⚠️  Skipping invite without join URL: {invite.title}")
             return
 
         # Skip if no start time
         if not invite.start_time:
-            print(f"⚠️  Skipping invite without start time: {invite.title}")
+            logger.warning(f"⚠️  Skipping invite without start time: {invite.title}")
             return
 
-        # Check if meeting has already ended
-        now = datetime.now().astimezone()
-        if invite.end_time and invite.end_time < now:
-            # Meeting already ended - record it as missed, don't RSVP
-            meeting = Meeting(
-                id=None,
-                project=invite.project,
-                title=invite.title,
-                start_time=invite.start_time,
-                end_time=invite.end_time,
-                join_url=invite.join_url,
-                platform="",
-                from_address=invite.from_address,
-                to_address=invite.to_address,
-                status="missed",
-                message_id=invite.message_id,
-                created_at=datetime.now().astimezone(),
-                raw_ics=invite.raw_ics,
-                uid=invite.uid
-            )
-            meeting_id = self.calendar.add_meeting(meeting)
-            if meeting_id:
-                print(f"⏰ Meeting already ended, marking as missed: {invite.title}")
+        if not self._ingest_invite(invite):
             return
 
-        # Check for conflicts
-        conflicts = self.calendar.check_conflicts(
-            invite.start_time,
-            invite.end_time
-        )
-
-        if conflicts:
-            conflict_titles = ", ".join(m.title for m in conflicts[:3])
-            if len(conflicts) > 3:
-                conflict_titles += f" (+{len(conflicts) - 3} more)"
-            reason = f"Scheduling conflict with: {conflict_titles}"
-
-            meeting = Meeting(
-                id=None,
-                project=invite.project,
-                title=invite.title,
-                start_time=invite.start_time,
-                end_time=invite.end_time,
-                join_url=invite.join_url,
-                platform="",
-                from_address=invite.from_address,
-                to_address=invite.to_address,
-                status="declined",
-                message_id=invite.message_id,
-                created_at=datetime.now().astimezone(),
-                raw_ics=invite.raw_ics,
-                uid=invite.uid
-            )
-
-            meeting_id = self.calendar.add_meeting(meeting)
-            if meeting_id:
-                print(f"⚠️  Declined: {meeting.title} (conflict with {len(conflicts)} meeting(s))")
-                if self.rsvp:
-                    self.rsvp.decline(invite, reason=reason)
+        # Check if we should join immediately (only pending meetings are
+        # returned by check_upcoming, so declined ones are never joined)
+        now = datetime.now(_LOCAL_TZ)
+        time_until = invite.start_time - now
+
+        # Case 1: Meeting starts soon
+        if 0 <= time_until.total_seconds() < (self.join_before_minutes + 1) * 60:
+            logger.info(f"⚡ Meeting starting soon, checking if we should join...")
+        # Case 2: Meeting already started but still ongoing
+        elif time_until.total_seconds() < 0 and (invite.end_time is None or invite.end_time > now):
+            logger.info(f"📍 Meeting already in progress, checking if we should join: {invite.title}")
         else:
-            meeting = Meeting(
-                id=None,
-                project=invite.project,
-                title=invite.title,
-                start_time=invite.start_time,
-                end_time=invite.end_time,
-                join_url=invite.join_url,
-                platform="",
-                from_address=invite.from_address,
-                to_address=invite.to_address,
-                status="pending",
-                message_id=invite.message_id,
-                created_at=datetime.now().astimezone(),
-                raw_ics=invite.raw_ics,
-                uid=invite.uid
-            )
-
-            meeting_id = self.calendar.add_meeting(meeting)
-            if meeting_id:
-                print(f"📅 Accepted: {meeting.title} ({meeting.project}) @ {meeting.start_time:%Y-%m-%d %H:%M}")
-                if self.rsvp:
-                    self.rsvp.accept(invite)
-
-                # Check if we should join immediately
-                now = datetime.now().astimezone()
-                time_until = meeting.start_time - now
+            return
+        # Run the join alongside the queued RSVP instead of holding up the
+        # next invite; trigger_join's claim keeps it from racing the loop
+        self._join_executor.submit(self._check_and_join_upcoming).add_done_callback(self._log_join_error)
 
-                # Case 1: Meeting starts soon
-                if time_until.total_seconds() < (self.join_before_minutes + 1) * 60 and time_until.total_seconds() >= 0:
-                    print(f"⚡ Meeting starting soon, checking if we should join...")
-                    self._check_and_join_upcoming()
-                # Case 2: Meeting already started but still ongoing
-                elif time_until.total_seconds() < 0:
-                    meeting_end = meeting.end_time
-                    if meeting_end is None or meeting_end > now:
-                        print(f"📍 Meeting already in progress, joining immediately: {meeting.title}")
-                        self._check_and_join_upcoming()
-                    else:
-                        print(f"⏰ Meeting already ended: {meeting.title}")
+    def _log_join_error(self, future):
+        """Report a failed background join check (executors drop exceptions)"""
+        if future.exception():
+            logger.error(f"❌ Error checking upcoming: {future.exception()}")
 
     def _check_and_join_upcoming(self):
         """Check for and join any upcoming meetings"""
@@ -480,33 +583,35 @@ class MeetingScheduler:
         Run scheduler with IMAP IDLE (push-based) instead of polling.
         New invites are processed immediately when they arrive.
         """
-        self.running = True
+        self._stop.clear()
 
         def signal_handler(sig, frame):
-            print("\n\n🛑 Shutting down scheduler...")
-            self.running = False
+            logger.info("\n\n🛑 Shutting down scheduler...")
+            self._stop.set()
             if hasattr(self, '_idle_monitor'):
                 self._idle_monitor.stop()
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
-        print("="*60)
-        print("🗓️  CCPM Meeting Scheduler Started (IDLE Mode)")
-        print(f"   Database: {'PostgreSQL' if self.calendar.use_postgres else 'SQLite'}")
-        print(f"   Mode: Push-based (IMAP IDLE)")
-        print(f"   Will join meetings {self.join_before_minutes} min before start")
-        print(f"   Auto RSVP: {'Enabled' if self.send_rsvp else 'Disabled'}")
-        print("   Press Ctrl+C to stop")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("🗓️  CCPM Meeting Scheduler Started (IDLE Mode)")
+        logger.info(f"   Database: {'PostgreSQL' if self.calendar.use_postgres else 'SQLite'}")
+        logger.info(f"   Mode: Push-based (IMAP IDLE)")
+        logger.info(f"   Will join meetings {self.join_before_minutes} min before start")
+        logger.info(f"   Auto RSVP: {'Enabled' if self.send_rsvp else 'Disabled'}")
+        logger.info("   Press Ctrl+C to stop")
+        logger.info("="*60)
 
         # Initial inbox sync to catch emails that arrived before we started
-        print("\n📥 Initial inbox sync...")
+        logger.info("\n📥 Initial inbox sync...")
         try:
             count = self.sync_inbox()
-            print(f"   Processed {count} new invite(s)")
+            logger.info(f"   Processed {count} new invite(s)")
         except Exception as e:
-            print(f"   Warning: Initial sync failed: {e}")
+            logger.warning(f"   Warning: Initial sync failed: {e}")
+        # From here on IdleMonitor holds its own session
+        self.inbox.disconnect()
 
         # Create IDLE monitor with our callback
         self._idle_monitor = IdleMonitor(
@@ -515,37 +620,59 @@ class MeetingScheduler:
             on_invite=self.process_invite
         )
 
-        # Start a background thread to check for upcoming meetings periodically
-        # (in case a meeting was scheduled before we started)
-        import threading
-
+        # Start a background thread to check for upcoming meetings. On Postgres
+        # it wakes as soon as a pending meeting is stored (LISTEN/NOTIFY);
+        # the 30s timeout also catches meetings scheduled before we started.
         def check_upcoming_loop():
-            while self.running:
+            listener = None
+            while not self._stop.is_set():
                 try:
                     self._check_and_join_upcoming()
                 except Exception as e:
-                    print(f"❌ Error checking upcoming: {e}")
-                # Check every 30 seconds
-                for _ in range(30):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                    logger.error(f"❌ Error checking upcoming: {e}")
+                try:
+                    if listener is None:
+                        listener = self.calendar.listen_upcoming()
+                    if listener is None:
+                        self._stop.wait(30)
+                    else:
+                        self.calendar.wait_upcoming(listener, 30)
+                except Exception as e:
+                    # Also raised when shutdown closes the pool under us
+                    if not self._stop.is_set():
+                        logger.warning(f"⚠️  Lost upcoming-meetings listener: {e}")
+                    self.calendar.release_listener(listener)
+                    listener = None
+                    self._stop.wait(30)
+            self.calendar.release_listener(listener)
 
         upcoming_thread = threading.Thread(target=check_upcoming_loop, daemon=True)
         upcoming_thread.start()
 
         # Run the IDLE monitor (this blocks)
         self._idle_monitor.run()
+        # IdleMonitor installs its own signal handlers; stop the upcoming loop too
+        self._stop.set()
 
-        print("Scheduler stopped.")
+        self.shutdown()
+        logger.info("Scheduler stopped.")
 
 
 def main():
+    listener = _setup_logging()
+    try:
+        _main()
+    finally:
+        # Drain whatever is still queued before exiting
+        listener.stop()
+
+
+def _main():
     parser = argparse.ArgumentParser(description="CCPM Meeting Scheduler")
     parser.add_argument("--once", action="store_true", help="Run once and exit")
     parser.add_argument("--sync", action="store_true", help="Just sync inbox to calendar")
-    parser.add_argument("--idle", action="store_true", help="Use IMAP IDLE (push-based) instead of polling")
-    parser.add_argument("--poll", type=int, default=60, help="Poll interval in seconds (ignored with --idle)")
+    parser.add_argument("--idle", action="store_true", help="Use IMAP IDLE (push-based); the default unless --poll is given")
+    parser.add_argument("--poll", type=int, help="Poll the inbox every N seconds instead of using IDLE")
     parser.add_argument("--no-rsvp", action="store_true", help="Disable automatic RSVP responses")
     args = parser.parse_args()
 
@@ -555,25 +682,27 @@ def main():
     database_url = os.environ.get("DATABASE_URL")
 
     if not email_address or not app_password:
-        print("❌ Missing credentials. Set:")
-        print("   export GMAIL_ADDRESS='your-email@gmail.com'")
-        print("   export GMAIL_APP_PASSWORD='your-app-password'")
+        logger.error("❌ Missing credentials. Set:")
+        logger.info("   export GMAIL_ADDRESS='your-email@gmail.com'")
+        logger.info("   export GMAIL_APP_PASSWORD='your-app-password'")
         sys.exit(1)
 
     scheduler = MeetingScheduler(
         email_address=email_address,
         app_password=app_password,
         database_url=database_url,
-        poll_interval=args.poll,
+        poll_interval=args.poll or 60,
         send_rsvp=not args.no_rsvp
     )
 
     if args.sync:
         count = scheduler.sync_inbox()
-        print(f"\n✅ Synced {count} new meeting(s)")
+        scheduler.shutdown()
+        logger.info(f"\n✅ Synced {count} new meeting(s)")
     elif args.once:
         scheduler.run_once()
-    elif args.idle:
+        scheduler.shutdown()
+    elif args.idle or args.poll is None:
         scheduler.run_idle()
     else:
         scheduler.run()
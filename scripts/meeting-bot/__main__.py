@@ -11,7 +11,7 @@ import argparse
 import os
 import sys
 
-from bot import MeetingBot
+from bot import MeetingBot, close_browser
 
 
 async def main():
@@ -79,6 +79,8 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        await close_browser()
 
 
 if __name__ == "__main__":
@@ -6,9 +6,14 @@ Joins meetings, records audio, and transcribes using Whisper.
 """
 
 import asyncio
+import ctypes
+import ctypes.util
 import os
-import subprocess
 import json
+import signal
+import struct
+import threading
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright
@@ -16,14 +21,221 @@ from playwright.async_api import async_playwright
 from platforms import google_meet, teams, zoom
 from capture.transcribe import transcribe_audio
 
+# Optional fast JSON for the local transcript fallback
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Optional PostgreSQL support
 try:
     import psycopg2
-    from psycopg2.extras import Json
+    import psycopg2.pool
+    from psycopg2.extras import Json, execute_values
     HAS_POSTGRES = True
 except ImportError:
     HAS_POSTGRES = False
 
+if HAS_POSTGRES:
+    class _PreparedConnection(psycopg2.extensions.connection):
+        """Connection that remembers whether ins_transcript is PREPAREd"""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.prepared = False
+
+# Shared by every save in this process, created on first use
+_PG_POOL = None
+_PG_POOL_LOCK = threading.Lock()
+
+_INSERT_TRANSCRIPT = """
+    INSERT INTO transcriptions
+        (meeting_id, full_text, segments, duration_seconds, model_used, language)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    RETURNING id
+"""
+
+# One row per Whisper segment; the parent row keeps only full_text
+_CREATE_SEGMENTS = """
+    CREATE TABLE IF NOT EXISTS transcript_segments (
+        transcript_id INTEGER NOT NULL REFERENCES transcriptions(id) ON DELETE CASCADE,
+        start_s REAL NOT NULL,
+        end_s REAL NOT NULL,
+        text TEXT NOT NULL
+    )
+"""
+
+
+def _pg_pool(database_url: str):
+    """Get the module's connection pool, creating it on first use."""
+    global _PG_POOL
+    with _PG_POOL_LOCK:
+        if _PG_POOL is None:
+            _PG_POOL = psycopg2.pool.ThreadedConnectionPool(
+                1, 4, database_url, connection_factory=_PreparedConnection
+            )
+        return _PG_POOL
+
+# Optional native PulseAudio capture (falls back to an ffmpeg subprocess)
+try:
+    _pa_simple = ctypes.CDLL(ctypes.util.find_library("pulse-simple") or "libpulse-simple.so.0")
+    HAS_PULSE = True
+except OSError:
+    HAS_PULSE = False
+
+
+class _PaSampleSpec(ctypes.Structure):
+    _fields_ = [("format", ctypes.c_int), ("rate", ctypes.c_uint32), ("channels", ctypes.c_uint8)]
+
+
+def _wav_header(data_bytes: int) -> bytes:
+    """44-byte header for 16 kHz mono s16le PCM with data_bytes of samples."""
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + data_bytes, b"WAVE",
+                       b"fmt ", 16, 1, 1, 16000, 32000, 2, 16, b"data", data_bytes)
+
+
+class _PulseRecorder:
+    """Record a PulseAudio source to a 16 kHz mono s16le WAV via the simple API."""
+
+    PA_STREAM_RECORD = 2
+    PA_SAMPLE_S16LE = 3
+    CHUNK = 4096
+
+    def __init__(self, source: str, path: Path):
+        _pa_simple.pa_simple_new.restype = ctypes.c_void_p
+        _pa_simple.pa_simple_read.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t,
+                                              ctypes.POINTER(ctypes.c_int)]
+        _pa_simple.pa_simple_free.argtypes = [ctypes.c_void_p]
+
+        spec = _PaSampleSpec(self.PA_SAMPLE_S16LE, 16000, 1)
+        error = ctypes.c_int(0)
+        self._stream = _pa_simple.pa_simple_new(
+            None, b"meeting-bot", self.PA_STREAM_RECORD, source.encode(), b"recording",
+            ctypes.byref(spec), None, None, ctypes.byref(error)
+        )
+        if not self._stream:
+            raise OSError(f"pa_simple_new failed (error {error.value})")
+
+        # PCM is appended straight from the read buffer; the header's sizes
+        # are patched in place on stop()
+        self._fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(self._fd, _wav_header(0))
+        self._data_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pulse-record", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Read fixed-size chunks straight into one buffer and append them to the WAV."""
+        buf = (ctypes.c_char * self.CHUNK)()
+        view = [memoryview(buf).cast("B")]
+        error = ctypes.c_int(0)
+        while not self._stop.is_set():
+            if _pa_simple.pa_simple_read(self._stream, buf, self.CHUNK, ctypes.byref(error)) < 0:
+                print(f"  Recording read failed (error {error.value})")
+                break
+            self._data_bytes += os.writev(self._fd, view)
+
+    def stop(self):
+        """Stop reading, free the stream and finalize the WAV header."""
+        self._stop.set()
+        # A read returns within one chunk (~128 ms at 32 kB/s)
+        self._thread.join(timeout=5)
+        if self._thread.is_alive():
+            # Still blocked in a read: the stream and fd stay with the thread
+            # (leaked) rather than being freed or closed under it
+            print("  Recording thread did not stop; leaving the WAV unfinalized")
+            return
+        _pa_simple.pa_simple_free(self._stream)
+        header = _wav_header(self._data_bytes)
+        os.pwrite(self._fd, header[4:8], 4)     # RIFF chunk size
+        os.pwrite(self._fd, header[40:44], 40)  # data chunk size
+        os.close(self._fd)
+
+
+# Meeting platform modules by name, and the URL hosts that identify them
+_PLATFORMS = {"google_meet": google_meet, "teams": teams, "zoom": zoom}
+_DETECT = (
+    ("meet.google.com", "google_meet"),
+    ("teams.microsoft.com", "teams"),
+    ("teams.live.com", "teams"),
+    ("zoom.us", "zoom"),
+)
+
+# Chromium flags for meeting pages
+_BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--autoplay-policy=no-user-gesture-required',
+    '--use-fake-ui-for-media-stream',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=GlobalMediaControls',
+    '--disable-notifications',
+    '--disable-setuid-sandbox',
+    '--blink-settings=imagesEnabled=false',  # Bot only needs the audio
+    '--renderer-process-limit=2',
+]
+
+# One Playwright driver and browser per process, shared by all bots
+_PW = None
+_BROWSER = None
+
+# Concurrent meeting contexts per browser, and meetings before the browser is
+# relaunched (long-lived Chromium accumulates leaked DOM memory)
+_MAX_CONTEXTS = 8
+_BROWSER_MAX_USES = 50
+_CONTEXT_SLOTS = asyncio.Semaphore(_MAX_CONTEXTS)
+_browser_uses = 0
+_active_contexts = 0
+
+
+async def _ensure_browser():
+    """Launch the shared browser on first use (or after it disconnected)."""
+    global _PW, _BROWSER
+    if _BROWSER is None or not _BROWSER.is_connected():
+        if _PW is None:
+            _PW = await async_playwright().start()
+        _BROWSER = await _PW.chromium.launch(
+            headless=False,  # Required for audio (headless mutes audio)
+            args=_BROWSER_ARGS
+        )
+    return _BROWSER
+
+
+@asynccontextmanager
+async def _meeting_context(**options):
+    """Open a context on the shared browser for one meeting, closed on exit."""
+    global _BROWSER, _browser_uses, _active_contexts
+    async with _CONTEXT_SLOTS:
+        if _browser_uses >= _BROWSER_MAX_USES and _active_contexts == 0 and _BROWSER is not None:
+            print("Relaunching browser...")
+            old, _BROWSER = _BROWSER, None
+            _browser_uses = 0
+            await old.close()
+
+        browser = await _ensure_browser()
+        context = await browser.new_context(**options)
+        _browser_uses += 1
+        _active_contexts += 1
+        try:
+            yield context
+        finally:
+            _active_contexts -= 1
+            await context.close()
+
+
+async def close_browser():
+    """Close the shared browser and stop Playwright."""
+    global _PW, _BROWSER, _browser_uses
+    if _BROWSER is not None:
+        await _BROWSER.close()
+        _BROWSER = None
+        _browser_uses = 0
+    if _PW is not None:
+        await _PW.stop()
+        _PW = None
+
 
 class MeetingBot:
     """Bot that joins meetings, records audio, and transcribes."""
@@ -37,6 +249,7 @@ class MeetingBot:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.audio_file = self.output_dir / "recording.wav"
         self.ffmpeg_process = None
+        self.recorder = None
         self.page = None
 
         # Database configuration
@@ -46,12 +259,9 @@ class MeetingBot:
 
     def _detect_platform(self, url: str) -> str:
         """Detect meeting platform from URL."""
-        if "meet.google.com" in url:
-            return "google_meet"
-        elif "teams.microsoft.com" in url or "teams.live.com" in url:
-            return "teams"
-        elif "zoom.us" in url:
-            return "zoom"
+        for host, platform in _DETECT:
+            if host in url:
+                return platform
         raise ValueError(f"Unknown meeting platform: {url}")
 
     def save_transcript_to_db(self, transcript: dict) -> bool:
@@ -61,27 +271,37 @@ class MeetingBot:
             return False
 
         try:
-            conn = psycopg2.connect(self.database_url)
-            cur = conn.cursor()
-
-            cur.execute("""
-                INSERT INTO transcriptions
-                    (meeting_id, full_text, segments, duration_seconds, model_used, language)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
-                self.meeting_id,
-                transcript.get('text', ''),
-                Json(transcript.get('segments', [])),
-                transcript.get('duration', 0),
-                transcript.get('model', 'small'),
-                transcript.get('language', 'en')
-            ))
-
-            transcript_id = cur.fetchone()[0]
-            conn.commit()
-            cur.close()
-            conn.close()
+            pool = _pg_pool(self.database_url)
+            conn = pool.getconn()
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        # Planned once per connection, then only EXECUTEd
+                        if not conn.prepared:
+                            cur.execute(_CREATE_SEGMENTS)
+                            cur.execute(f"PREPARE ins_transcript AS {_INSERT_TRANSCRIPT}")
+                            conn.prepared = True
+                        cur.execute("EXECUTE ins_transcript (%s, %s, %s, %s, %s, %s)", (
+                            self.meeting_id,
+                            transcript.get('text', ''),
+                            Json([]),  # Segments go to transcript_segments
+                            transcript.get('duration', 0),
+                            transcript.get('model', 'small'),
+                            transcript.get('language', 'en')
+                        ))
+                        transcript_id = cur.fetchone()[0]
+                        execute_values(cur, """
+                            INSERT INTO transcript_segments (transcript_id, start_s, end_s, text)
+                            VALUES %s
+                        """, [
+                            (transcript_id, seg['start'], seg['end'], seg['text'])
+                            for seg in transcript.get('segments', [])
+                        ], page_size=1000)
+            except:
+                # Drop the connection rather than guess its PREPARE state
+                pool.putconn(conn, close=True)
+                raise
+            pool.putconn(conn)
 
             print(f"Transcript saved to database (id: {transcript_id})")
             return True
@@ -92,7 +312,7 @@ class MeetingBot:
             traceback.print_exc()
             return False
 
-    def start_audio_recording(self):
+    async def start_audio_recording(self):
         """Start recording system audio via PulseAudio null-sink monitor."""
         print("Starting audio recording...")
 
@@ -100,14 +320,31 @@ class MeetingBot:
         # The entrypoint.sh sets this up and exports AUDIO_SOURCE
         monitor_source = os.environ.get("AUDIO_SOURCE", "VirtualSpeaker.monitor")
 
-        # Verify the source exists
+        # Start capturing from the expected source while pactl verifies it;
+        # the stream handshake then overlaps source enumeration
+        verify = asyncio.create_task(self._verify_audio_source(monitor_source))
+        await self._start_capture(monitor_source)
+        chosen = await verify
+
+        if chosen != monitor_source:
+            print(f"  Restarting capture on {chosen}")
+            await self._stop_capture()
+            await self._start_capture(chosen)
+
+        print(f"  Audio source: {chosen}")
+        print(f"  Recording to: {self.audio_file}")
+
+    async def _verify_audio_source(self, monitor_source: str) -> str:
+        """Check monitor_source exists, returning it or the best alternative."""
         try:
-            result = subprocess.run(
-                ["pactl", "list", "short", "sources"],
-                capture_output=True,
-                text=True
+            # Async so Playwright keeps servicing the page meanwhile
+            proc = await asyncio.create_subprocess_exec(
+                "pactl", "list", "short", "sources",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
             )
-            sources = result.stdout.strip()
+            out, _ = await proc.communicate()
+            sources = out.decode(errors="replace").strip()
             print(f"  Available sources:\n{sources}")
 
             if monitor_source not in sources:
@@ -130,28 +367,52 @@ class MeetingBot:
         except Exception as e:
             print(f"  Warning: Could not verify audio source: {e}")
 
-        print(f"  Audio source: {monitor_source}")
+        return monitor_source
 
-        self.ffmpeg_process = subprocess.Popen([
+    async def _start_capture(self, source: str):
+        """Start the native recorder (or ffmpeg) on source."""
+        if HAS_PULSE:
+            try:
+                self.recorder = await asyncio.to_thread(_PulseRecorder, source, self.audio_file)
+                return
+            except OSError as e:
+                print(f"  Native capture unavailable ({e}), using ffmpeg")
+
+        self.ffmpeg_process = await asyncio.create_subprocess_exec(
             "ffmpeg", "-y",
+            "-nostats", "-loglevel", "error", "-nostdin",  # No progress output to format
             "-f", "pulse",
-            "-i", monitor_source,
+            "-i", source,
             "-ac", "1",              # Mono
             "-ar", "16000",          # 16kHz for Whisper
             "-acodec", "pcm_s16le",  # WAV format
-            str(self.audio_file)
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-        print(f"  Recording to: {self.audio_file}")
-
-    def stop_audio_recording(self):
-        """Stop ffmpeg recording."""
-        if self.ffmpeg_process:
-            self.ffmpeg_process.terminate()
+            str(self.audio_file),
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,  # Own process group, so stop reaches any children
+        )
+
+    async def _stop_capture(self):
+        """Stop whichever capture is running."""
+        if self.recorder:
+            await asyncio.to_thread(self.recorder.stop)
+            self.recorder = None
+        elif self.ffmpeg_process:
+            pid = self.ffmpeg_process.pid
             try:
-                self.ffmpeg_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.ffmpeg_process.kill()
+                os.killpg(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # Already exited
+            try:
+                await asyncio.wait_for(self.ffmpeg_process.wait(), 5)
+            except asyncio.TimeoutError:
+                os.killpg(pid, signal.SIGKILL)
+                await self.ffmpeg_process.wait()
+            self.ffmpeg_process = None
+
+    async def stop_audio_recording(self):
+        """Stop the native recorder or ffmpeg."""
+        if self.recorder or self.ffmpeg_process:
+            await self._stop_capture()
 
             if self.audio_file.exists():
                 size = self.audio_file.stat().st_size
@@ -169,28 +430,11 @@ class MeetingBot:
         Returns:
             Transcript dict with segments and full text
         """
-        async with async_playwright() as p:
-            # Launch browser with audio permissions
-            browser = await p.chromium.launch(
-                headless=False,  # Required for audio (headless mutes audio)
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--autoplay-policy=no-user-gesture-required',
-                    '--use-fake-ui-for-media-stream',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=GlobalMediaControls',
-                    '--disable-notifications',
-                    '--disable-setuid-sandbox',
-                ]
-            )
-
-            context = await browser.new_context(
-                permissions=['microphone', 'camera'],
-                viewport={'width': 1920, 'height': 1080},
-            )
-
+        # Reuse the process-wide browser; each meeting gets its own context
+        async with _meeting_context(
+            permissions=['microphone', 'camera'],
+            viewport={'width': 1920, 'height': 1080},
+        ) as context:
             self.page = await context.new_page()
 
             # Join meeting based on platform
@@ -200,45 +444,39 @@ class MeetingBot:
             print(f"Project: {self.project}")
             print(f"{'='*60}\n")
 
-            if self.platform == "google_meet":
-                await google_meet.join(self.page, self.url)
-            elif self.platform == "teams":
-                await teams.join(self.page, self.url)
-            elif self.platform == "zoom":
-                await zoom.join(self.page, self.url)
+            platform = _PLATFORMS[self.platform]
+            await platform.join(self.page, self.url)
 
             # Start audio recording
-            self.start_audio_recording()
+            await self.start_audio_recording()
 
             # Wait for meeting to end or timeout
             await self._wait_for_meeting_end(max_duration_hours)
 
             # Stop recording
-            self.stop_audio_recording()
+            await self.stop_audio_recording()
 
             # Leave meeting gracefully
-            if self.platform == "google_meet":
-                await google_meet.leave(self.page)
-            elif self.platform == "teams":
-                await teams.leave(self.page)
-            elif self.platform == "zoom":
-                await zoom.leave(self.page)
-
-            await browser.close()
+            await platform.leave(self.page)
 
         # Transcribe with Whisper
         if self.audio_file.exists() and self.audio_file.stat().st_size > 1000:
             print("\nTranscribing with Whisper...")
-            transcript = transcribe_audio(self.audio_file)
+            # Whisper and the DB write block for minutes; keep the loop free
+            loop = asyncio.get_running_loop()
+            transcript = await loop.run_in_executor(None, transcribe_audio, self.audio_file)
 
             # Save to PostgreSQL if configured
             if self.use_postgres:
-                self.save_transcript_to_db(transcript)
+                await loop.run_in_executor(None, self.save_transcript_to_db, transcript)
             else:
                 # Fallback: Save transcript to local files
                 transcript_file = self.output_dir / "transcript.json"
-                with open(transcript_file, "w") as f:
-                    json.dump(transcript, f, indent=2)
+                if HAS_ORJSON:
+                    transcript_file.write_bytes(orjson.dumps(transcript, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(transcript_file, "w") as f:
+                        json.dump(transcript, f, indent=2)
                 print(f"Transcript saved: {transcript_file}")
 
                 # Also save as readable markdown
@@ -260,30 +498,29 @@ class MeetingBot:
 
     async def _wait_for_meeting_end(self, max_hours: float):
         """Wait for meeting to end or timeout."""
-        check_interval = 10  # seconds
-        max_checks = int(max_hours * 3600 / check_interval)
+        platform = _PLATFORMS[self.platform]
 
         print(f"Waiting for meeting to end (max {max_hours} hours)...")
 
-        for i in range(max_checks):
-            await asyncio.sleep(check_interval)
-
-            # Check if meeting ended
-            ended = False
-            if self.platform == "google_meet":
-                ended = await google_meet.is_meeting_ended(self.page)
-            elif self.platform == "teams":
-                ended = await teams.is_meeting_ended(self.page)
-            elif self.platform == "zoom":
-                ended = await zoom.is_meeting_ended(self.page)
-
-            if ended:
-                print("Meeting ended by host")
-                return
-
+        async def report_progress():
             # Print progress every 5 minutes
-            if i > 0 and i % 30 == 0:
-                elapsed = i * check_interval / 60
-                print(f"  Still in meeting... ({elapsed:.0f} min elapsed)")
+            elapsed = 0
+            while True:
+                await asyncio.sleep(300)
+                elapsed += 5
+                print(f"  Still in meeting... ({elapsed} min elapsed)")
 
-        print(f"Timeout reached ({max_hours} hours)")
+        progress = asyncio.create_task(report_progress())
+        try:
+            # One wait in the page for an end indicator, instead of a query every 10s
+            ended = await platform.wait_for_end(self.page, int(max_hours * 3600 * 1000))
+        except Exception as e:
+            print(f"Lost the meeting page: {e}")
+            return
+        finally:
+            progress.cancel()
+
+        if ended:
+            print("Meeting ended by host")
+        else:
+            print(f"Timeout reached ({max_hours} hours)")
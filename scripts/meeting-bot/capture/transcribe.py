@@ -5,27 +5,75 @@ Whisper Transcription Module
 Uses faster-whisper for CPU-optimized speech-to-text.
 """
 
+import os
+import json
+import hashlib
+import platform
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+# Optional fast hashing for the transcript cache (falls back to blake2b)
+try:
+    from blake3 import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
 
-def transcribe_audio(audio_path: Path, model_size: str = "small") -> dict:
+# Transcripts keyed by audio fingerprint, so retries skip Whisper entirely
+CACHE_DIR = Path("~/.cache/ccpm/whisper").expanduser()
+
+# Distilled English checkpoint: same encoder, far fewer decoder layers
+DEFAULT_MODEL = os.getenv("WHISPER_MODEL", "distil-small.en")
+
+# ARM64 NEON dot-product kernels for int8 weights with fp16 activations;
+# plain int8 elsewhere
+COMPUTE_TYPE = "int8_float16" if platform.machine() == "aarch64" else "int8"
+
+
+def _fingerprint(audio_path: Path) -> str:
+    """Hash the audio file in 1 MB blocks."""
+    h = blake3() if HAS_BLAKE3 else hashlib.blake2b(digest_size=32)
+    with open(audio_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=2)
+def _get_model(model_size: str, device: str, compute_type: str):
+    """Load a WhisperModel once per (size, device, compute type)."""
+    from faster_whisper import WhisperModel
+
+    print(f"Loading Whisper model: {model_size}")
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=os.cpu_count() or 0,  # 0 = CTranslate2 default
+        num_workers=2,
+    )
+
+
+def transcribe_audio(audio_path: Path, model_size: str = DEFAULT_MODEL) -> dict:
     """
     Transcribe audio file using faster-whisper.
 
     Args:
         audio_path: Path to WAV file
-        model_size: whisper model (tiny, base, small, medium, large)
+        model_size: whisper model (tiny, base, small, medium, large, distil-small.en)
 
     Returns:
         Dict with segments and full text
     """
-    from faster_whisper import WhisperModel
-
-    print(f"Loading Whisper model: {model_size}")
+    cache_file = CACHE_DIR / f"{_fingerprint(audio_path)}-{model_size}.json"
+    if cache_file.exists():
+        print(f"Using cached transcript: {cache_file}")
+        # Older cache files predate the "model" key
+        return {"model": model_size, **json.loads(cache_file.read_text())}
 
-    # CPU mode for ARM64 - use int8 for speed
-    model = WhisperModel(model_size, device="cpu", compute_type="int8")
+    # CPU mode - quantized for speed
+    model = _get_model(model_size, "cpu", COMPUTE_TYPE)
 
     print(f"Transcribing: {audio_path}")
     segments, info = model.transcribe(
@@ -33,11 +81,18 @@ def transcribe_audio(audio_path: Path, model_size: str = "small") -> dict:
         beam_size=1,  # Faster on CPU
         language="en",
         vad_filter=True,  # Skip silence
+        vad_parameters={"min_silence_duration_ms": 500},
+        # Each window decodes without the previous text as prompt: shorter
+        # decoder context, and no repetition carried across windows
+        condition_on_previous_text=False,
+        chunk_length=30,
+        without_timestamps=False,
     )
 
     result = {
         "language": info.language,
         "duration": info.duration,
+        "model": model_size,
         "segments": []
     }
 
@@ -53,6 +108,12 @@ def transcribe_audio(audio_path: Path, model_size: str = "small") -> dict:
         print(f"[{segment.start:.1f}s -> {segment.end:.1f}s] {segment.text.strip()}")
 
     result["text"] = " ".join(full_text)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(result))
+    except OSError as e:
+        print(f"Warning: Could not cache transcript: {e}")
     return result
 
 
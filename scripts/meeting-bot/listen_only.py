@@ -21,6 +21,8 @@ import asyncio
 import argparse
 import time
 import threading
+from collections import deque
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 
@@ -34,6 +36,16 @@ from trigger import TriggerClient, TriggerDecision, OLLAMA_URL, TRIGGER_MODEL
 TRIGGER_INTERVAL = float(os.getenv("TRIGGER_INTERVAL", "5.0"))  # Check every 5 seconds
 LOG_FILE = os.getenv("LOG_FILE", "/tmp/meeting-bot-listen.log")
 
+# Reuse a recent decision when the transcript window is this similar (Jaccard)
+DECISION_REUSE_SIMILARITY = 0.85
+DECISION_CACHE_SIZE = 64
+
+
+def _shingles(text: str) -> set:
+    """Word 3-grams of the recent transcript, for near-duplicate detection."""
+    words = text[-500:].lower().split()
+    return {" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+
 
 class ListenOnlyBot:
     """
@@ -60,6 +72,13 @@ class ListenOnlyBot:
         self._running = False
         self._trigger_thread: threading.Thread = None
         self._decisions: list[dict] = []
+        # Wakes the trigger loop on stop; hash of the last transcript sent to Ollama
+        self._stop_evt = threading.Event()
+        self._last_input_hash = None
+        # (shingles, decision) for recent windows, oldest evicted first
+        self._dec_cache: deque = deque(maxlen=DECISION_CACHE_SIZE)
+        # LOG_FILE, held open (line-buffered) while listening
+        self._log_fp = None
 
         # Vosk model path
         self.vosk_model_path = vosk_model_path or os.getenv(
@@ -74,8 +93,11 @@ class ListenOnlyBot:
 
         # Also write to log file
         try:
-            with open(LOG_FILE, "a") as f:
-                f.write(line + "\n")
+            if self._log_fp:
+                self._log_fp.write(line + "\n")
+            else:
+                with open(LOG_FILE, "a") as f:
+                    f.write(line + "\n")
         except Exception:
             pass
 
@@ -87,29 +109,41 @@ class ListenOnlyBot:
 
     def _trigger_loop(self):
         """Periodically check if bot should respond."""
-        last_check = time.time()
-
-        while self._running:
-            time.sleep(0.5)  # Check every 500ms if it's time
-
-            now = time.time()
-            if now - last_check < self.trigger_interval:
-                continue
-
-            last_check = now
-
+        while not self._stop_evt.wait(self.trigger_interval):
             # Get current transcript buffer
             transcript = self.buffer.get_text()
             if not transcript or len(transcript) < 20:
                 continue  # Not enough text yet
 
+            # Nothing new was said since the last decision
+            input_hash = hash(transcript)
+            if input_hash == self._last_input_hash:
+                continue
+            self._last_input_hash = input_hash
+
+            # Adjacent windows overlap heavily; reuse a near-identical decision
+            shingles = _shingles(transcript)
+            cached = self._cached_decision(shingles)
+            if cached:
+                self._log_decision(cached, transcript)
+                continue
+
             # Check trigger
             try:
                 decision = self.trigger.should_respond(transcript)
+                self._dec_cache.append((shingles, decision))
                 self._log_decision(decision, transcript)
             except Exception as e:
                 self._log(f"Trigger error: {e}", "ERROR")
 
+    def _cached_decision(self, shingles: set):
+        """A recent decision for a window at least DECISION_REUSE_SIMILARITY similar, if any."""
+        for cached_shingles, decision in reversed(self._dec_cache):
+            union = len(shingles | cached_shingles)
+            if union and len(shingles & cached_shingles) / union >= DECISION_REUSE_SIMILARITY:
+                return replace(decision, reason=f"cached: {decision.reason}", latency_ms=0)
+        return None
+
     def _log_decision(self, decision: TriggerDecision, transcript: str):
         """Log trigger decision."""
         record = {
@@ -137,6 +171,11 @@ class ListenOnlyBot:
 
     def start_listening(self, audio_source: str = "default"):
         """Start ASR and trigger checking (no meeting join)."""
+        if self._log_fp is None:
+            try:
+                self._log_fp = open(LOG_FILE, "a", buffering=1)
+            except Exception:
+                pass
         self._log("Starting listen-only mode...")
 
         # Initialize ASR
@@ -145,7 +184,8 @@ class ListenOnlyBot:
             return False
 
         try:
-            self.asr = VoskStreamingASR(model_path=self.vosk_model_path)
+            # Decode in a worker process, clear of the browser automation
+            self.asr = VoskStreamingASR(model_path=self.vosk_model_path, separate_process=True)
         except FileNotFoundError as e:
             self._log(str(e), "ERROR")
             self._log("Download model from: https://alphacephei.com/vosk/models", "ERROR")
@@ -164,6 +204,7 @@ class ListenOnlyBot:
 
         # Start ASR
         self._running = True
+        self._stop_evt.clear()
         self.asr.start(on_transcript=self._on_transcript, audio_source=audio_source)
 
         # Start trigger loop
@@ -176,11 +217,15 @@ class ListenOnlyBot:
     def stop_listening(self):
         """Stop ASR and trigger checking."""
         self._running = False
+        self._stop_evt.set()
         if self.asr:
             self.asr.stop()
         if self._trigger_thread:
             self._trigger_thread.join(timeout=2.0)
         self._log("Stopped listening.")
+        if self._log_fp:
+            self._log_fp.close()
+            self._log_fp = None
 
     def print_summary(self):
         """Print summary of trigger decisions."""
@@ -245,16 +290,22 @@ class ListenOnlyBot:
                 await browser.close()
                 return
 
-            # Wait until meeting ends or interrupted
+            # Wait until meeting ends or interrupted; the page itself watches
+            # for the end message, we only check stop requests each second
+            ended = asyncio.Event()
+            watcher = asyncio.create_task(self._watch_meeting_end(page, ended))
             try:
                 while self._running:
-                    await asyncio.sleep(1)
-                    # Check if we've left the meeting
-                    if await self._check_meeting_ended(page):
-                        self._log("Meeting ended.")
-                        break
+                    try:
+                        await asyncio.wait_for(ended.wait(), timeout=1)
+                    except asyncio.TimeoutError:
+                        continue
+                    self._log("Meeting ended.")
+                    break
             except asyncio.CancelledError:
                 self._log("Cancelled.")
+            finally:
+                watcher.cancel()
 
             self.stop_listening()
             await browser.close()
@@ -323,19 +374,15 @@ class ListenOnlyBot:
         except:
             self._log("Could not find Join button", "WARN")
 
-    async def _check_meeting_ended(self, page) -> bool:
-        """Check if meeting has ended."""
+    async def _watch_meeting_end(self, page, ended: asyncio.Event):
+        """Set ended once the meeting-ended message appears (no polling)."""
+        # Google Meet
+        locator = page.locator('text="You left the meeting"').or_(page.locator('text="Call ended"'))
         try:
-            # Google Meet
-            ended = await page.locator('text="You left the meeting"').is_visible(timeout=100)
-            if ended:
-                return True
-            ended = await page.locator('text="Call ended"').is_visible(timeout=100)
-            if ended:
-                return True
-        except:
-            pass
-        return False
+            await locator.first.wait_for(state="visible", timeout=0)
+        except Exception:
+            return  # Page closed
+        ended.set()
 
 
 def main():
@@ -384,7 +431,7 @@ def main():
         try:
             if args.file:
                 # For file, wait until processing completes
-                while bot._running and bot.asr._ffmpeg_proc and bot.asr._ffmpeg_proc.poll() is None:
+                while bot._running and bot.asr.is_alive():
                     time.sleep(0.5)
                 time.sleep(2)  # Let final transcripts process
             else:
@@ -1,6 +1,33 @@
 # Platform-specific meeting join logic
+
+
+def any_of(page, selectors: list):
+    """Locator matching any of selectors (for text= selectors, which can't be comma-joined)."""
+    locator = page.locator(selectors[0])
+    for selector in selectors[1:]:
+        locator = locator.or_(page.locator(selector))
+    return locator.first
+
+
+async def wait_for_end(page, indicators: list, timeout_ms: int) -> bool:
+    """
+    Wait for any of a platform's end indicators without polling.
+
+    Returns:
+        True when an end indicator appears, False on timeout
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    try:
+        await any_of(page, indicators).wait_for(state="visible", timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# Imported after the helpers, which the platform modules use
 from . import google_meet
 from . import teams
 from . import zoom
 
-__all__ = ['google_meet', 'teams', 'zoom']
+__all__ = ['google_meet', 'teams', 'zoom', 'any_of', 'wait_for_end']
@@ -5,7 +5,59 @@ Google Meet Join Logic
 Handles joining a Google Meet meeting via Playwright.
 """
 
-from playwright.async_api import Page
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING
+
+from . import any_of, wait_for_end as _wait_for_end
+
+# Page is only an annotation; Playwright itself is imported when first needed
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# Pre-join controls; each comma-joined list is resolved in one query
+CAMERA_SELECTOR = (
+    '[aria-label*="camera" i][aria-pressed="true"], '
+    '[aria-label*="Turn off camera" i], '
+    '[data-tooltip*="camera" i]'
+)
+MIC_SELECTOR = (
+    '[aria-label*="microphone" i][aria-pressed="true"], '
+    '[aria-label*="Turn off microphone" i], '
+    '[data-tooltip*="microphone" i]'
+)
+NAME_SELECTOR = 'input[aria-label="Your name"]'
+# Exact names only: a bare "Join" also matches buttons like "Other ways to join"
+JOIN_BUTTON_NAME = re.compile(r"^(Ask to join|Join now)$")
+
+
+async def _toggle_camera(page: Page):
+    """Turn off camera (multiple possible selectors)."""
+    try:
+        await page.locator(CAMERA_SELECTOR).first.click(timeout=3000)
+        print("  Camera turned off")
+    except Exception:
+        pass
+
+
+async def _toggle_mic(page: Page):
+    """Turn off microphone."""
+    try:
+        await page.locator(MIC_SELECTOR).first.click(timeout=3000)
+        print("  Microphone turned off")
+    except Exception:
+        pass
+
+
+async def _fill_name(page: Page, bot_name: str):
+    """Enter name if prompted (guest join)."""
+    try:
+        await page.locator(NAME_SELECTOR).fill(bot_name, timeout=3000)
+        print(f"  Set name: {bot_name}")
+    except Exception:
+        pass
 
 
 async def join(page: Page, url: str, bot_name: str = "CCPM Meeting Bot"):
@@ -19,85 +71,46 @@ async def join(page: Page, url: str, bot_name: str = "CCPM Meeting Bot"):
     """
     print(f"Joining Google Meet: {url}")
 
-    await page.goto(url)
+    # Controls are auto-waited below, so don't wait for the page load itself
+    await page.goto(url, wait_until="commit")
 
     # Dismiss "Got it" or other popups
     try:
         await page.click('button:has-text("Got it")', timeout=3000)
-    except:
+    except Exception:
         pass
 
     try:
         await page.click('button:has-text("Dismiss")', timeout=2000)
-    except:
+    except Exception:
         pass
 
-    # Wait for pre-join screen to load
-    await page.wait_for_load_state("networkidle", timeout=15000)
-
-    # Turn off camera (multiple possible selectors)
-    camera_selectors = [
-        '[aria-label*="camera" i][aria-pressed="true"]',
-        '[aria-label*="Turn off camera" i]',
-        '[data-tooltip*="camera" i]',
-    ]
-    for selector in camera_selectors:
-        try:
-            await page.click(selector, timeout=2000)
-            print("  Camera turned off")
-            break
-        except:
-            continue
-
-    # Turn off microphone
-    mic_selectors = [
-        '[aria-label*="microphone" i][aria-pressed="true"]',
-        '[aria-label*="Turn off microphone" i]',
-        '[data-tooltip*="microphone" i]',
-    ]
-    for selector in mic_selectors:
-        try:
-            await page.click(selector, timeout=2000)
-            print("  Microphone turned off")
-            break
-        except:
-            continue
-
-    # Enter name if prompted (guest join)
-    try:
-        name_input = page.locator('input[aria-label="Your name"]')
-        if await name_input.is_visible(timeout=3000):
-            await name_input.fill(bot_name)
-            print(f"  Set name: {bot_name}")
-    except:
-        pass
+    # Pre-join controls are independent, so set them up concurrently
+    await asyncio.gather(_toggle_camera(page), _toggle_mic(page), _fill_name(page, bot_name))
 
     # Click "Ask to join" or "Join now"
-    join_selectors = [
-        'button:has-text("Ask to join")',
-        'button:has-text("Join now")',
-        'button:has-text("Join")',
-    ]
-    for selector in join_selectors:
-        try:
-            await page.click(selector, timeout=5000)
-            print("  Clicked join button")
-            break
-        except:
-            continue
+    try:
+        await page.get_by_role("button", name=JOIN_BUTTON_NAME).first.click(timeout=5000)
+        print("  Clicked join button")
+    except Exception:
+        pass
 
     # Wait for meeting to load (look for meeting controls)
     try:
-        await page.wait_for_selector('[aria-label*="Leave call" i]', timeout=60000)
+        # Checked on every animation frame, not on a polling timer
+        await page.wait_for_function(
+            """() => !!document.querySelector('[aria-label*="Leave call" i]')""",
+            polling="raf", timeout=60000,
+        )
         print("Successfully joined meeting!")
-    except:
+    except Exception:
         print("Warning: Could not confirm meeting join")
 
     # Enable captions if available
     try:
         await page.click('[aria-label*="caption" i]', timeout=5000)
         print("  Captions enabled")
-    except:
+    except Exception:
         print("  Captions not available or already enabled")
 
 
@@ -106,21 +119,26 @@ async def leave(page: Page):
     try:
         await page.click('[aria-label*="Leave call" i]', timeout=5000)
         print("Left the meeting")
-    except:
+    except Exception:
         print("Could not find leave button")
 
 
+# Shown once the call is over
+END_INDICATORS = [
+    'text="You left the meeting"',
+    'text="The meeting has ended"',
+    'text="Return to home screen"',
+]
+
+
 async def is_meeting_ended(page: Page) -> bool:
-    """Check if the meeting has ended."""
-    end_indicators = [
-        'text="You left the meeting"',
-        'text="The meeting has ended"',
-        'text="Return to home screen"',
-    ]
-    for selector in end_indicators:
-        try:
-            if await page.locator(selector).is_visible(timeout=1000):
-                return True
-        except:
-            continue
-    return False
+    """Check if the meeting has ended (one query, no waiting)."""
+    try:
+        return await any_of(page, END_INDICATORS).is_visible()
+    except Exception:
+        return False
+
+
+async def wait_for_end(page: Page, timeout_ms: int) -> bool:
+    """Wait for the meeting to end; False on timeout."""
+    return await _wait_for_end(page, END_INDICATORS, timeout_ms)
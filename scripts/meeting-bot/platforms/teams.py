@@ -5,7 +5,43 @@ Microsoft Teams Join Logic
 Handles joining a Teams meeting via Playwright.
 """
 
-from playwright.async_api import Page
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from . import any_of, wait_for_end as _wait_for_end
+
+# Page is only an annotation; Playwright itself is imported when first needed
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+async def _toggle_camera(page: Page):
+    """Turn off camera."""
+    try:
+        await page.click('[aria-label*="camera" i]', timeout=3000)
+        print("  Camera toggled")
+    except Exception:
+        pass
+
+
+async def _toggle_mic(page: Page):
+    """Turn off microphone."""
+    try:
+        await page.click('[aria-label*="microphone" i]', timeout=3000)
+        print("  Microphone toggled")
+    except Exception:
+        pass
+
+
+async def _fill_name(page: Page, bot_name: str):
+    """Enter name."""
+    try:
+        await page.locator('input[placeholder*="name" i]').first.fill(bot_name, timeout=3000)
+        print(f"  Set name: {bot_name}")
+    except Exception:
+        pass
 
 
 async def join(page: Page, url: str, bot_name: str = "CCPM Meeting Bot"):
@@ -25,53 +61,35 @@ async def join(page: Page, url: str, bot_name: str = "CCPM Meeting Bot"):
     else:
         url += "?msLaunch=false&directDl=false&suppressPrompt=true"
 
-    await page.goto(url)
+    # Controls are auto-waited below, so don't wait for the page load itself
+    await page.goto(url, wait_until="commit")
 
-    # Click "Continue on this browser" if prompted
+    # Click "Continue on this browser" if prompted (first sign the page is up)
     try:
         await page.click('button:has-text("Continue on this browser")', timeout=10000)
         print("  Selected browser client")
-    except:
+    except Exception:
         pass
 
-    # Wait for pre-join screen
-    await page.wait_for_load_state("networkidle", timeout=15000)
-
-    # Turn off camera
-    try:
-        await page.click('[aria-label*="camera" i]', timeout=3000)
-        print("  Camera toggled")
-    except:
-        pass
-
-    # Turn off microphone
-    try:
-        await page.click('[aria-label*="microphone" i]', timeout=3000)
-        print("  Microphone toggled")
-    except:
-        pass
-
-    # Enter name
-    try:
-        name_input = page.locator('input[placeholder*="name" i]')
-        if await name_input.is_visible(timeout=3000):
-            await name_input.fill(bot_name)
-            print(f"  Set name: {bot_name}")
-    except:
-        pass
+    # Pre-join controls are independent, so set them up concurrently
+    await asyncio.gather(_toggle_camera(page), _toggle_mic(page), _fill_name(page, bot_name))
 
     # Click join button
     try:
         await page.click('button:has-text("Join now")', timeout=10000)
         print("  Clicked join")
-    except:
+    except Exception:
         pass
 
     # Wait for meeting to load
     try:
-        await page.wait_for_selector('[aria-label*="Leave" i]', timeout=60000)
+        # Checked on every animation frame, not on a polling timer
+        await page.wait_for_function(
+            """() => !!document.querySelector('[aria-label*="Leave" i]')""",
+            polling="raf", timeout=60000,
+        )
         print("Successfully joined Teams meeting!")
-    except:
+    except Exception:
         print("Warning: Could not confirm meeting join")
 
 
@@ -80,15 +98,22 @@ async def leave(page: Page):
     try:
         await page.click('[aria-label*="Leave" i]', timeout=5000)
         print("Left the meeting")
-    except:
+    except Exception:
         print("Could not find leave button")
 
 
+# Shown once the call is over
+END_INDICATORS = ['text="You left the meeting"']
+
+
 async def is_meeting_ended(page: Page) -> bool:
-    """Check if the meeting has ended."""
+    """Check if the meeting has ended (one query, no waiting)."""
     try:
-        if await page.locator('text="You left the meeting"').is_visible(timeout=1000):
-            return True
-    except:
-        pass
-    return False
+        return await any_of(page, END_INDICATORS).is_visible()
+    except Exception:
+        return False
+
+
+async def wait_for_end(page: Page, timeout_ms: int) -> bool:
+    """Wait for the meeting to end; False on timeout."""
+    return await _wait_for_end(page, END_INDICATORS, timeout_ms)
@@ -6,7 +6,15 @@ Handles joining a Zoom meeting via web client.
 Note: Host must enable "Join from browser" for this to work.
 """
 
-from playwright.async_api import Page
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from . import any_of, wait_for_end as _wait_for_end
+
+# Page is only an annotation; Playwright itself is imported when first needed
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 
 async def join(page: Page, url: str, bot_name: str = "CCPM Meeting Bot"):
@@ -20,47 +28,47 @@ async def join(page: Page, url: str, bot_name: str = "CCPM Meeting Bot"):
     """
     print(f"Joining Zoom: {url}")
 
-    await page.goto(url)
+    # Controls are auto-waited below, so don't wait for the page load itself
+    await page.goto(url, wait_until="commit")
 
     # Look for "Join from Your Browser" link
     try:
         await page.click('a:has-text("Join from Your Browser")', timeout=10000)
         print("  Selected browser client")
-    except:
+    except Exception:
         # May already be on web client page
         pass
 
-    # Wait for pre-join screen
-    await page.wait_for_load_state("networkidle", timeout=15000)
-
     # Enter name
     try:
-        name_input = page.locator('#inputname, input[placeholder*="name" i]')
-        if await name_input.is_visible(timeout=3000):
-            await name_input.fill(bot_name)
-            print(f"  Set name: {bot_name}")
-    except:
+        await page.locator('#inputname, input[placeholder*="name" i]').first.fill(bot_name, timeout=3000)
+        print(f"  Set name: {bot_name}")
+    except Exception:
         pass
 
     # Click join button
     try:
         await page.click('button:has-text("Join")', timeout=10000)
         print("  Clicked join")
-    except:
+    except Exception:
         pass
 
     # Handle "Join Audio" prompt
     try:
         await page.click('button:has-text("Join Audio by Computer")', timeout=10000)
         print("  Joined audio")
-    except:
+    except Exception:
         pass
 
     # Wait for meeting to load
     try:
-        await page.wait_for_selector('[aria-label*="Leave" i]', timeout=60000)
+        # Checked on every animation frame, not on a polling timer
+        await page.wait_for_function(
+            """() => !!document.querySelector('[aria-label*="Leave" i]')""",
+            polling="raf", timeout=60000,
+        )
         print("Successfully joined Zoom meeting!")
-    except:
+    except Exception:
         print("Warning: Could not confirm meeting join")
 
 
@@ -70,15 +78,22 @@ async def leave(page: Page):
         await page.click('[aria-label*="Leave" i]', timeout=5000)
         await page.click('button:has-text("Leave Meeting")', timeout=3000)
         print("Left the meeting")
-    except:
+    except Exception:
         print("Could not find leave button")
 
 
+# Shown once the call is over
+END_INDICATORS = ['text="This meeting has been ended"']
+
+
 async def is_meeting_ended(page: Page) -> bool:
-    """Check if the meeting has ended."""
+    """Check if the meeting has ended (one query, no waiting)."""
     try:
-        if await page.locator('text="This meeting has been ended"').is_visible(timeout=1000):
-            return True
-    except:
-        pass
-    return False
+        return await any_of(page, END_INDICATORS).is_visible()
+    except Exception:
+        return False
+
+
+async def wait_for_end(page: Page, timeout_ms: int) -> bool:
+    """Wait for the meeting to end; False on timeout."""
+    return await _wait_for_end(page, END_INDICATORS, timeout_ms)
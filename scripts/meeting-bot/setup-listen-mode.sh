@@ -7,7 +7,8 @@ set -e
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 MODEL_DIR="${SCRIPT_DIR}/models"
-VOSK_MODEL="vosk-model-small-en-us-0.15"
+# Override to use another model, e.g. an int8-quantized one on ARM64
+VOSK_MODEL="${VOSK_MODEL:-vosk-model-small-en-us-0.15}"
 VOSK_URL="https://alphacephei.com/vosk/models/${VOSK_MODEL}.zip"
 
 echo "=============================================="
@@ -104,7 +105,7 @@ echo "=============================================="
 cat > "${SCRIPT_DIR}/.env.listen" << EOF
 export VOSK_MODEL_PATH="${MODEL_DIR}/${VOSK_MODEL}"
 export OLLAMA_URL="${OLLAMA_URL:-http://ollama:11434}"
-export TRIGGER_MODEL="qwen2:1.5b"
+export TRIGGER_MODEL="qwen2:1.5b-instruct-q4_0"
 export TRIGGER_THRESHOLD="0.7"
 EOF
 
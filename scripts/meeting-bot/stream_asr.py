@@ -7,8 +7,7 @@ Designed for ARM64 with low latency.
 
 import os
 import json
-import queue
-import threading
+from collections import deque
 from pathlib import Path
 from typing import Callable, Optional
 from dataclasses import dataclass
@@ -21,6 +20,13 @@ except ImportError:
     VOSK_AVAILABLE = False
     print("Warning: vosk not installed. Run: pip install vosk")
 
+# Faster JSON for the per-chunk recognizer results (optional)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Audio capture
 try:
     import sounddevice as sd
@@ -34,6 +40,9 @@ except ImportError:
 VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "/app/models/vosk-model-small-en-us-0.15")
 SAMPLE_RATE = 16000
 
+# Loaded Vosk models by path, shared by every recognizer in the process
+_MODEL_CACHE: dict = {}
+
 
 @dataclass
 class TranscriptSegment:
@@ -64,10 +73,8 @@ class VoskStreamingASR:
         self.model_path = model_path
         self.model: Optional[vosk.Model] = None
         self.recognizer: Optional[vosk.KaldiRecognizer] = None
-        self._audio_queue: queue.Queue = queue.Queue()
         self._running = False
         self._stream: Optional[sd.InputStream] = None
-        self._process_thread: Optional[threading.Thread] = None
         self._callback: Optional[Callable[[TranscriptSegment], None]] = None
 
     def _load_model(self):
@@ -78,9 +85,12 @@ class VoskStreamingASR:
                     f"Vosk model not found at {self.model_path}. "
                     f"Download from https://alphacephei.com/vosk/models"
                 )
-            print(f"Loading Vosk model from {self.model_path}...")
-            vosk.SetLogLevel(-1)  # Suppress Vosk logs
-            self.model = vosk.Model(self.model_path)
+            if self.model_path not in _MODEL_CACHE:
+                print(f"Loading Vosk model from {self.model_path}...")
+                vosk.SetLogLevel(-1)  # Suppress Vosk logs
+                _MODEL_CACHE[self.model_path] = vosk.Model(self.model_path)
+            self.model = _MODEL_CACHE[self.model_path]
+            # Recognizer holds decoding state, so it stays per instance
             self.recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
             self.recognizer.SetWords(True)
             print("Vosk model loaded.")
@@ -89,36 +99,33 @@ class VoskStreamingASR:
         """Called by sounddevice for each audio chunk."""
         if status:
             print(f"Audio status: {status}")
-        self._audio_queue.put(bytes(indata))
-
-    def _process_audio(self):
-        """Process audio from queue and emit transcripts."""
-        while self._running:
-            try:
-                data = self._audio_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-
-            if self.recognizer.AcceptWaveform(data):
-                # Final result for this utterance
-                result = json.loads(self.recognizer.Result())
-                text = result.get("text", "").strip()
-                if text and self._callback:
-                    self._callback(TranscriptSegment(
-                        text=text,
-                        is_final=True,
-                        confidence=1.0
-                    ))
-            else:
-                # Partial result
-                partial = json.loads(self.recognizer.PartialResult())
-                text = partial.get("partial", "").strip()
-                if text and self._callback:
-                    self._callback(TranscriptSegment(
-                        text=text,
-                        is_final=False,
-                        confidence=0.5
-                    ))
+        if self._running:
+            # Decode right here: PortAudio calls back from a single thread
+            # One contiguous copy of the int16 array (Vosk needs bytes)
+            self._process_audio(indata.tobytes())
+
+    def _process_audio(self, data: bytes):
+        """Feed one chunk to Vosk and emit transcripts."""
+        if self.recognizer.AcceptWaveform(data):
+            # Final result for this utterance
+            result = _loads(self.recognizer.Result())
+            text = result.get("text", "").strip()
+            if text and self._callback:
+                self._callback(TranscriptSegment(
+                    text=text,
+                    is_final=True,
+                    confidence=1.0
+                ))
+        else:
+            # Partial result
+            partial = _loads(self.recognizer.PartialResult())
+            text = partial.get("partial", "").strip()
+            if text and self._callback:
+                self._callback(TranscriptSegment(
+                    text=text,
+                    is_final=False,
+                    confidence=0.5
+                ))
 
     def start(self, on_transcript: Callable[[TranscriptSegment], None], device: Optional[int] = None):
         """
@@ -143,10 +150,6 @@ class VoskStreamingASR:
         )
         self._stream.start()
 
-        # Start processing thread
-        self._process_thread = threading.Thread(target=self._process_audio, daemon=True)
-        self._process_thread.start()
-
         print(f"Streaming ASR started (device: {device or 'default'})")
 
     def stop(self):
@@ -155,8 +158,6 @@ class VoskStreamingASR:
         if self._stream:
             self._stream.stop()
             self._stream.close()
-        if self._process_thread:
-            self._process_thread.join(timeout=2.0)
         print("Streaming ASR stopped.")
 
     def list_devices(self):
@@ -170,44 +171,57 @@ class TranscriptBuffer:
     Rolling buffer of recent transcript text.
 
     Keeps the last N seconds of transcript for trigger decisions.
+    Single writer: add()/clear() run on the ASR thread, get_text() anywhere.
     """
 
     def __init__(self, max_chars: int = 2000, max_segments: int = 50):
         self.max_chars = max_chars
         self.max_segments = max_segments
-        self._segments: list[str] = []
-        self._lock = threading.Lock()
+        self._segments: deque = deque()
+        # " ".join(self._segments)[-max_chars:], kept up to date by add()
+        self._text = ""
+        self._joined_len = 0  # Length of the untrimmed join
 
     def add(self, segment: TranscriptSegment):
         """Add a transcript segment (only final segments are kept)."""
         if not segment.is_final:
             return
 
-        with self._lock:
-            self._segments.append(segment.text)
-            # Trim old segments
-            while len(self._segments) > self.max_segments:
-                self._segments.pop(0)
+        text, joined_len = self._text, self._joined_len
+        if self._segments:
+            text = (text + " " + segment.text)[-self.max_chars:]
+            joined_len += 1 + len(segment.text)
+        else:
+            text = segment.text[-self.max_chars:]
+            joined_len = len(segment.text)
+        self._segments.append(segment.text)
+
+        while len(self._segments) > self.max_segments:
+            dropped = self._segments.popleft()
+            joined_len -= len(dropped) + 1
+            if len(text) > joined_len:
+                text = text[len(text) - joined_len:]
+
+        self._joined_len = joined_len
+        # Published in one assignment, so readers never see a half update
+        self._text = text
 
     def get_text(self) -> str:
         """Get the full transcript buffer as text."""
-        with self._lock:
-            text = " ".join(self._segments)
-            # Trim to max chars (keep recent)
-            if len(text) > self.max_chars:
-                text = text[-self.max_chars:]
-            return text
+        return self._text
 
     def clear(self):
         """Clear the buffer."""
-        with self._lock:
-            self._segments.clear()
+        self._segments.clear()
+        self._joined_len = 0
+        self._text = ""
 
 
 # --- CLI for testing ---
 
 if __name__ == "__main__":
     import argparse
+    import sys
     import time
 
     parser = argparse.ArgumentParser(description="Test Vosk streaming ASR")
@@ -226,10 +240,20 @@ if __name__ == "__main__":
     asr = VoskStreamingASR(model_path=args.model)
     buffer = TranscriptBuffer()
 
+    last_partial = 0.0
+
     def on_transcript(seg: TranscriptSegment):
+        global last_partial
         buffer.add(seg)
-        marker = "✓" if seg.is_final else "..."
-        print(f"[{marker}] {seg.text}")
+        if seg.is_final:
+            # Replace the partial line with the final text
+            sys.stdout.write(f"\r\033[K[✓] {seg.text}\n")
+            sys.stdout.flush()
+        elif time.monotonic() - last_partial >= 0.25:
+            # Partials overwrite one line, at most 4 writes per second
+            last_partial = time.monotonic()
+            sys.stdout.write(f"\r\033[K[...] {seg.text}")
+            sys.stdout.flush()
 
     print(f"\nListening for {args.duration} seconds...")
     print("Speak into your microphone.\n")
@@ -7,9 +7,11 @@ Works on ARM64 without PortAudio.
 
 import os
 import json
-import queue
+import fcntl
+import multiprocessing
 import subprocess
 import threading
+from collections import deque
 from typing import Callable, Optional
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,10 +23,20 @@ except ImportError:
     VOSK_AVAILABLE = False
     print("Warning: vosk not installed. Run: pip install vosk")
 
+# Faster JSON for the per-chunk recognizer results (optional)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "/home/ubuntu/ccpm/scripts/meeting-bot/models/vosk-model-small-en-us-0.15")
 SAMPLE_RATE = 16000
 
+# Loaded Vosk models by path, shared by every recognizer in the process
+_MODEL_CACHE: dict = {}
+
 
 @dataclass
 class TranscriptSegment:
@@ -34,37 +46,81 @@ class TranscriptSegment:
     confidence: float = 0.0
 
 
+def _asr_worker(model_path: str, sample_rate: int, audio_source: str, out_q, stop_evt):
+    """Worker process entry point: run the ASR here, send segments to the parent.
+
+    Failures are sent as an exception before the final None, so the parent can log them.
+    """
+    asr = None
+    try:
+        asr = VoskStreamingASR(model_path=model_path, sample_rate=sample_rate)
+        asr.start(on_transcript=out_q.put, audio_source=audio_source)
+        # Run until stopped, or until ffmpeg exits (end of file, or a failure)
+        while not stop_evt.wait(0.5):
+            if not asr._process_thread.is_alive() and asr._ffmpeg_proc.poll() is None:
+                raise RuntimeError("decoder thread stopped while ffmpeg was still running")
+            code = asr._ffmpeg_proc.poll()
+            if code is not None:
+                asr._process_thread.join()  # Decode what was already read
+                if code != 0:
+                    raise RuntimeError(f"ffmpeg exited with code {code}")
+                break
+    except Exception as e:
+        # Sent as a plain RuntimeError: not every exception type pickles
+        out_q.put(RuntimeError(f"{type(e).__name__}: {e}"))
+    finally:
+        if asr:
+            asr.stop()
+        out_q.put(None)
+
+
 class VoskStreamingASR:
     """
     Real-time speech recognition using Vosk + FFmpeg.
 
     Captures audio from PulseAudio/PipeWire using ffmpeg and transcribes with Vosk.
+    With separate_process=True, ffmpeg and Vosk run in a worker process, so
+    decoding doesn't compete for the GIL with the caller (e.g. Playwright).
     """
 
-    def __init__(self, model_path: str = VOSK_MODEL_PATH, sample_rate: int = SAMPLE_RATE):
+    def __init__(self, model_path: str = VOSK_MODEL_PATH, sample_rate: int = SAMPLE_RATE,
+                 separate_process: bool = False):
         if not VOSK_AVAILABLE:
             raise RuntimeError("Vosk not installed. Run: pip install vosk")
 
         self.sample_rate = sample_rate
         self.model_path = model_path
+        self.separate_process = separate_process
+        self._worker: Optional[multiprocessing.Process] = None
+        self._worker_stop = None
+        self._out_q = None
         self.model: Optional[vosk.Model] = None
         self.recognizer: Optional[vosk.KaldiRecognizer] = None
         self._running = False
         self._ffmpeg_proc: Optional[subprocess.Popen] = None
         self._process_thread: Optional[threading.Thread] = None
         self._callback: Optional[Callable[[TranscriptSegment], None]] = None
+        # 0.5s of 16-bit mono audio per chunk
+        self._chunk_bytes = sample_rate
+
+    def _check_model_path(self):
+        """Fail early if the Vosk model isn't there."""
+        if not Path(self.model_path).exists():
+            raise FileNotFoundError(
+                f"Vosk model not found at {self.model_path}. "
+                f"Download from https://alphacephei.com/vosk/models"
+            )
 
     def _load_model(self):
         """Load Vosk model (lazy loading)."""
         if self.model is None:
-            if not Path(self.model_path).exists():
-                raise FileNotFoundError(
-                    f"Vosk model not found at {self.model_path}. "
-                    f"Download from https://alphacephei.com/vosk/models"
-                )
-            print(f"Loading Vosk model from {self.model_path}...")
-            vosk.SetLogLevel(-1)  # Suppress Vosk logs
-            self.model = vosk.Model(self.model_path)
+            self._check_model_path()
+            if self.model_path not in _MODEL_CACHE:
+                print(f"Loading Vosk model from {self.model_path}...")
+                vosk.SetLogLevel(-1)  # Suppress Vosk logs
+                _MODEL_CACHE[self.model_path] = vosk.Model(self.model_path)
+            self.model = _MODEL_CACHE[self.model_path]
+            # Recognizer holds decoding state, so it stays per instance
             self.recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
             self.recognizer.SetWords(True)
             print("Vosk model loaded.")
@@ -72,14 +128,14 @@ class VoskStreamingASR:
     def _process_audio(self):
         """Read audio from ffmpeg and transcribe."""
         while self._running and self._ffmpeg_proc:
-            # Read chunk from ffmpeg stdout
-            data = self._ffmpeg_proc.stdout.read(8000)  # 0.5s at 16kHz, 16-bit
+            # Read chunk from ffmpeg stdout (Vosk's binding only takes bytes)
+            data = self._ffmpeg_proc.stdout.read(self._chunk_bytes)
             if not data:
                 break
 
             if self.recognizer.AcceptWaveform(data):
                 # Final result for this utterance
-                result = json.loads(self.recognizer.Result())
+                result = _loads(self.recognizer.Result())
                 text = result.get("text", "").strip()
                 if text and self._callback:
                     self._callback(TranscriptSegment(
@@ -89,7 +145,7 @@ class VoskStreamingASR:
                     ))
             else:
                 # Partial result
-                partial = json.loads(self.recognizer.PartialResult())
+                partial = _loads(self.recognizer.PartialResult())
                 text = partial.get("partial", "").strip()
                 if text and self._callback:
                     self._callback(TranscriptSegment(
@@ -98,6 +154,33 @@ class VoskStreamingASR:
                         confidence=0.5
                     ))
 
+    def _relay_segments(self):
+        """Hand segments from the worker process to the callback."""
+        while (segment := self._out_q.get()) is not None:
+            if isinstance(segment, Exception):
+                print(f"❌ ASR worker failed: {segment}")
+            elif self._callback:
+                self._callback(segment)
+
+    def _start_worker(self, audio_source: str):
+        """Run capture and decoding in a worker process."""
+        self._check_model_path()
+        # Spawn rather than fork: the parent may be running Playwright's threads
+        ctx = multiprocessing.get_context("spawn")
+        self._out_q = ctx.SimpleQueue()
+        self._worker_stop = ctx.Event()
+        self._worker = ctx.Process(
+            target=_asr_worker,
+            args=(self.model_path, self.sample_rate, audio_source, self._out_q, self._worker_stop),
+            daemon=True,
+        )
+        self._worker.start()
+
+        self._process_thread = threading.Thread(target=self._relay_segments, daemon=True)
+        self._process_thread.start()
+
+        print(f"Streaming ASR started in worker process (source: {audio_source})")
+
     def start(self, on_transcript: Callable[[TranscriptSegment], None], audio_source: str = "default"):
         """
         Start streaming ASR.
@@ -106,9 +189,13 @@ class VoskStreamingASR:
             on_transcript: Callback for each transcript segment
             audio_source: PulseAudio source name, or path to audio file for testing
         """
-        self._load_model()
         self._callback = on_transcript
         self._running = True
+        if self.separate_process:
+            self._start_worker(audio_source)
+            return
+
+        self._load_model()
 
         # Check if audio_source is a file (for testing)
         if Path(audio_source).exists():
@@ -116,11 +203,13 @@ class VoskStreamingASR:
             print(f"Reading from audio file: {audio_source}")
             self._ffmpeg_proc = subprocess.Popen([
                 "ffmpeg",
+                "-nostats", "-nostdin",
                 "-i", audio_source,       # Input file
                 "-ac", "1",               # Mono
                 "-ar", str(self.sample_rate),  # 16kHz
+                # Emit exactly one read chunk (0.5s) per frame
+                "-af", f"asetnsamples=n={self.sample_rate // 2}:p=0",
                 "-f", "s16le",            # Raw 16-bit PCM
-                "-acodec", "pcm_s16le",
                 "-loglevel", "error",
                 "-"                       # Output to stdout
             ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
@@ -129,25 +218,50 @@ class VoskStreamingASR:
             # Output: 16kHz mono 16-bit PCM to stdout
             self._ffmpeg_proc = subprocess.Popen([
                 "ffmpeg",
+                "-nostats", "-nostdin",
+                # Raw PCM needs no probing or input buffering
+                "-fflags", "nobuffer", "-flags", "low_delay",
+                "-probesize", "32", "-analyzeduration", "0",
                 "-f", "pulse",           # PulseAudio/PipeWire input
                 "-i", audio_source,      # Source (default = system default)
                 "-ac", "1",              # Mono
                 "-ar", str(self.sample_rate),  # 16kHz
+                # Emit exactly one read chunk (0.5s) per frame
+                "-af", f"asetnsamples=n={self.sample_rate // 2}:p=0",
                 "-f", "s16le",           # Raw 16-bit PCM
-                "-acodec", "pcm_s16le",
                 "-loglevel", "error",    # Suppress ffmpeg output
                 "-"                      # Output to stdout
             ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
 
+        # Room for ~30s of audio in the pipe, so a slow decode doesn't stall ffmpeg
+        if hasattr(fcntl, "F_SETPIPE_SZ"):
+            try:
+                fcntl.fcntl(self._ffmpeg_proc.stdout.fileno(), fcntl.F_SETPIPE_SZ, 1 << 20)
+            except OSError:
+                pass  # Above /proc/sys/fs/pipe-max-size
+
         # Start processing thread
         self._process_thread = threading.Thread(target=self._process_audio, daemon=True)
         self._process_thread.start()
 
         print(f"Streaming ASR started (source: {audio_source})")
 
+    def is_alive(self) -> bool:
+        """Whether audio is still being captured and decoded."""
+        if self._worker:
+            return self._worker.is_alive()
+        return bool(self._ffmpeg_proc) and self._ffmpeg_proc.poll() is None
+
     def stop(self):
         """Stop streaming ASR."""
         self._running = False
+        if self._worker:
+            self._worker_stop.set()
+            self._worker.join(timeout=5.0)
+            if self._worker.is_alive():
+                self._worker.terminate()
+            # Release the relay thread, also when the worker already exited
+            self._out_q.put(None)
         if self._ffmpeg_proc:
             self._ffmpeg_proc.terminate()
             self._ffmpeg_proc.wait()
@@ -159,42 +273,58 @@ class VoskStreamingASR:
 class TranscriptBuffer:
     """
     Rolling buffer of recent transcript text.
+
+    Single writer: add()/clear() run on the ASR thread, get_text() anywhere.
     """
 
     def __init__(self, max_chars: int = 2000, max_segments: int = 50):
         self.max_chars = max_chars
         self.max_segments = max_segments
-        self._segments: list[str] = []
-        self._lock = threading.Lock()
+        self._segments: deque = deque()
+        # " ".join(self._segments)[-max_chars:], kept up to date by add()
+        self._text = ""
+        self._joined_len = 0  # Length of the untrimmed join
 
     def add(self, segment: TranscriptSegment):
         """Add a transcript segment (only final segments are kept)."""
         if not segment.is_final:
             return
 
-        with self._lock:
-            self._segments.append(segment.text)
-            while len(self._segments) > self.max_segments:
-                self._segments.pop(0)
+        text, joined_len = self._text, self._joined_len
+        if self._segments:
+            text = (text + " " + segment.text)[-self.max_chars:]
+            joined_len += 1 + len(segment.text)
+        else:
+            text = segment.text[-self.max_chars:]
+            joined_len = len(segment.text)
+        self._segments.append(segment.text)
+
+        while len(self._segments) > self.max_segments:
+            dropped = self._segments.popleft()
+            joined_len -= len(dropped) + 1
+            if len(text) > joined_len:
+                text = text[len(text) - joined_len:]
+
+        self._joined_len = joined_len
+        # Published in one assignment, so readers never see a half update
+        self._text = text
 
     def get_text(self) -> str:
         """Get the full transcript buffer as text."""
-        with self._lock:
-            text = " ".join(self._segments)
-            if len(text) > self.max_chars:
-                text = text[-self.max_chars:]
-            return text
+        return self._text
 
     def clear(self):
         """Clear the buffer."""
-        with self._lock:
-            self._segments.clear()
+        self._segments.clear()
+        self._joined_len = 0
+        self._text = ""
 
 
 # --- CLI for testing ---
 
 if __name__ == "__main__":
     import argparse
+    import sys
     import time
 
     parser = argparse.ArgumentParser(description="Test Vosk streaming ASR with FFmpeg")
@@ -213,10 +343,20 @@ if __name__ == "__main__":
     asr = VoskStreamingASR(model_path=args.model)
     buffer = TranscriptBuffer()
 
+    last_partial = 0.0
+
     def on_transcript(seg: TranscriptSegment):
+        global last_partial
         buffer.add(seg)
-        marker = "✓" if seg.is_final else "..."
-        print(f"[{marker}] {seg.text}")
+        if seg.is_final:
+            # Replace the partial line with the final text
+            sys.stdout.write(f"\r\033[K[✓] {seg.text}\n")
+            sys.stdout.flush()
+        elif time.monotonic() - last_partial >= 0.25:
+            # Partials overwrite one line, at most 4 writes per second
+            last_partial = time.monotonic()
+            sys.stdout.write(f"\r\033[K[...] {seg.text}")
+            sys.stdout.flush()
 
     print(f"\nListening for {args.duration} seconds...")
     print("Speak into your microphone.\n")
@@ -6,24 +6,100 @@ Designed for low-latency (<500ms) decisions on ARM64.
 """
 
 import os
+import re
+import json
 import time
+import socket
+import threading
 import httpx
-from dataclasses import dataclass
-from typing import Optional
-
-# Ollama service URL (K8s internal)
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Optional, Union
+
+# Faster JSON for Ollama responses, which carry a long "context" array (optional)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# Local ONNX text classifier that answers clear-cut cases before the LLM (optional)
+try:
+    import numpy as np
+    import onnxruntime as ort
+    HAS_ONNX = True
+except ImportError:
+    HAS_ONNX = False
+
+# Ollama service URL (K8s internal), or unix:///path/to.sock for a local socket
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434")
-TRIGGER_MODEL = os.getenv("TRIGGER_MODEL", "qwen2:1.5b")
+# Q4_0 weights are repacked by llama.cpp into i8mm/SVE matmul layouts on ARM64
+# hosts; TRIGGER_MODEL_ARM_VARIANT pins a model per ARM node pool
+TRIGGER_MODEL = (
+    os.getenv("TRIGGER_MODEL_ARM_VARIANT")
+    or os.getenv("TRIGGER_MODEL", "qwen2:1.5b-instruct-q4_0")
+)
 TRIGGER_THRESHOLD = float(os.getenv("TRIGGER_THRESHOLD", "0.7"))
+# How long Ollama keeps the model (and its cached system-prompt prefix) loaded
+TRIGGER_KEEP_ALIVE = os.getenv("TRIGGER_KEEP_ALIVE", "24h")  # Same as the Ollama deployment
+
+# Transcripts shorter than this, or with no question and no mention of the
+# bot, are answered NO without asking the LLM
+TRIGGER_MIN_CHARS = int(os.getenv("TRIGGER_MIN_CHARS", "20"))
+_TRIGGER_HINT = re.compile(r"\?|\b(?:ai|bot|assistant)\b", re.IGNORECASE)
+
+# In-flight requests per client; match OLLAMA_NUM_PARALLEL on the server
+TRIGGER_MAX_CONCURRENCY = int(os.getenv("TRIGGER_MAX_CONCURRENCY", "4"))
+
+# ONNX model exported from a scikit-learn text pipeline (e.g. TfidfVectorizer +
+# LogisticRegression via skl2onnx): string input, [label, probabilities] output.
+# Scores within TRIGGER_CLASSIFIER_MARGIN of the threshold still go to the LLM
+TRIGGER_CLASSIFIER_PATH = os.getenv("TRIGGER_CLASSIFIER_PATH", "")
+TRIGGER_CLASSIFIER_MARGIN = float(os.getenv("TRIGGER_CLASSIFIER_MARGIN", "0.1"))
+
+# No Nagle delay on the small request bodies; TCP keepalive probes stop the
+# conntrack table from silently dropping pooled connections while idle
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux
+    _SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3),
+    ]
+
+# LLM decisions remembered per transcript tail
+DECISION_CACHE_SIZE = 128
+CACHE_TAIL_CHARS = 512
+
 
+# Direct requests for the bot, answered YES without asking the LLM
+_FAST_YES = re.compile(
+    r"\b(hey ai|the (?:meeting )?bot|ask (?:the )?(?:ai|bot|assistant)|what do you think,? ai)\b",
+    re.IGNORECASE,
+)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TriggerDecision:
-    """Result of trigger evaluation."""
+    """Result of trigger evaluation (immutable, so cached instances are shared safely)."""
     should_respond: bool
     confidence: float
     reason: str
-    latency_ms: float
+    latency_ms: int
+
+
+# Decision prompt around the transcript, as JSON string fragments: the request
+# body is spliced from pre-encoded bytes instead of re-encoding the fixed fields
+_PROMPT_PREFIX = b',"prompt":"Meeting transcript:\\n'
+_PROMPT_SUFFIX = b'\\n\\nShould the AI speak? YES or NO:"}'
 
 
 # System prompt for trigger decisions - uses few-shot examples for small models
@@ -56,83 +132,120 @@ class TriggerClient:
         threshold: float = TRIGGER_THRESHOLD,
         timeout: float = 30.0,  # 30 second timeout for ARM64 with phi3:mini
     ):
+        # unix:// URLs connect over a Unix domain socket, skipping TCP
+        uds = None
+        socket_options = _SOCKET_OPTIONS
+        if ollama_url.startswith("unix://"):
+            uds = ollama_url[len("unix://"):]
+            ollama_url = "http://localhost"
+            socket_options = None  # TCP options don't apply to Unix sockets
         self.ollama_url = ollama_url.rstrip("/")
         self.model = model
         self.threshold = threshold
         self.timeout = timeout
-        self._client = httpx.Client(timeout=timeout)
-
-    def should_respond(self, transcript_buffer: str) -> TriggerDecision:
+        # Persistent connections to Ollama, kept well past the decision interval
+        self._client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=85.0),
+            transport=httpx.HTTPTransport(uds=uds, retries=0, socket_options=socket_options),
+        )
+        # hash(normalized transcript tail) -> TriggerDecision, least recently used first
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(TRIGGER_MAX_CONCURRENCY)
+        self._classifier = None
+        if TRIGGER_CLASSIFIER_PATH and HAS_ONNX:
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = 2
+            self._classifier = ort.InferenceSession(
+                TRIGGER_CLASSIFIER_PATH, options, providers=["CPUExecutionProvider"]
+            )
+            self._classifier_input = self._classifier.get_inputs()[0].name
+        # Fixed fields of every decision request, encoded once (object left open)
+        self._generate_head = _dumps({
+            "model": self.model,
+            # Fixed system prompt first: Ollama reuses its KV cache
+            # for the matching prefix, so only the transcript is prefilled
+            "system": TRIGGER_SYSTEM_PROMPT,
+            "stream": False,
+            "keep_alive": TRIGGER_KEEP_ALIVE,
+            "options": {
+                "num_predict": 1,  # One token: YES or NO
+                "temperature": 0.1,  # Deterministic
+                "top_k": 2,
+                "stop": ["\n"],
+            },
+        })[:-1] + _PROMPT_PREFIX
+        # Background decisions for callers that must not block (see submit)
+        self._pool = ThreadPoolExecutor(max_workers=TRIGGER_MAX_CONCURRENCY, thread_name_prefix="trigger")
+        # Latency of the last successful ensure_ready(), None until then
+        self._ready_ms: Optional[int] = None
+
+    def should_respond(self, transcript_buffer: Union[str, deque]) -> TriggerDecision:
         """
         Evaluate if the bot should respond based on recent transcript.
 
         Args:
-            transcript_buffer: Last 30-60 seconds of transcript text
+            transcript_buffer: Last 30-60 seconds of transcript text, or a
+                bounded deque of text chunks (e.g. deque(maxlen=400) of lines,
+                newline-terminated) so callers never grow one long string
 
         Returns:
             TriggerDecision with confidence score and recommendation
         """
-        start = time.perf_counter()
+        start_ns = time.perf_counter_ns()
 
-        # Truncate very long transcripts (focus on recent context)
-        if len(transcript_buffer) > 2000:
-            transcript_buffer = transcript_buffer[-2000:]
+        if not isinstance(transcript_buffer, str):
+            transcript_buffer = "".join(transcript_buffer)
 
-        try:
-            response = self._client.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": f"Meeting transcript:\n{transcript_buffer}\n\nShould the AI speak? YES or NO:",
-                    "system": TRIGGER_SYSTEM_PROMPT,
-                    "stream": False,
-                    "options": {
-                        "num_predict": 5,  # Only need YES or NO
-                        "temperature": 0.1,  # Deterministic
-                    },
-                },
+        # Explicit mentions of the bot need no LLM round-trip
+        match = _FAST_YES.search(transcript_buffer[-500:])
+        if match:
+            return TriggerDecision(
+                should_respond=True,
+                confidence=1.0,
+                reason=f"Keyword fast-path: {match.group(0)!r}",
+                latency_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
             )
-            response.raise_for_status()
-            result = response.json()
-
-            latency_ms = (time.perf_counter() - start) * 1000
-
-            # Parse YES/NO from response
-            raw_output = result.get("response", "").strip().upper()
-
-            if "YES" in raw_output:
-                confidence = 1.0
-                should_respond = True
-            elif "NO" in raw_output:
-                confidence = 0.0
-                should_respond = False
-            else:
-                # Fallback: try to parse as number
-                try:
-                    confidence = float(raw_output.split()[0])
-                    confidence = max(0.0, min(1.0, confidence))
-                    should_respond = confidence >= self.threshold
-                except (ValueError, IndexError):
-                    confidence = 0.0
-                    should_respond = False
 
+        stripped = transcript_buffer.strip()
+        if len(stripped) < TRIGGER_MIN_CHARS or not _TRIGGER_HINT.search(stripped):
             return TriggerDecision(
-                should_respond=should_respond,
-                confidence=confidence,
-                reason=f"LLM confidence: {confidence:.2f} (threshold: {self.threshold})",
-                latency_ms=latency_ms,
+                should_respond=False,
+                confidence=0.0,
+                reason="Too short / no trigger tokens",
+                latency_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+            )
+
+        # Whitespace/case-insensitive, so reflowed ASR text reuses the decision
+        key = hash(" ".join(transcript_buffer[-CACHE_TAIL_CHARS:].lower().split()))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached:
+                self._cache.move_to_end(key)
+        if cached:
+            return replace(
+                cached,
+                reason=f"cached: {cached.reason}",
+                latency_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
             )
 
+        decision = self._classify(transcript_buffer, start_ns)
+        if decision:
+            return decision
+
+        try:
+            decision = self._ask_llm(transcript_buffer, start_ns)
         except httpx.TimeoutException:
-            latency_ms = (time.perf_counter() - start) * 1000
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return TriggerDecision(
                 should_respond=False,
                 confidence=0.0,
-                reason=f"Timeout after {latency_ms:.0f}ms",
+                reason=f"Timeout after {latency_ms}ms",
                 latency_ms=latency_ms,
             )
         except Exception as e:
-            latency_ms = (time.perf_counter() - start) * 1000
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return TriggerDecision(
                 should_respond=False,
                 confidence=0.0,
@@ -140,52 +253,189 @@ class TriggerClient:
                 latency_ms=latency_ms,
             )
 
+        # Only real answers are cached, never timeouts or errors
+        with self._cache_lock:
+            self._cache[key] = decision
+            if len(self._cache) > DECISION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return decision
+
+    def _classify(self, transcript_buffer: str, start_ns: int) -> Optional[TriggerDecision]:
+        """Score with the local classifier; None when absent, failing or ambiguous."""
+        if self._classifier is None:
+            return None
+        try:
+            outputs = self._classifier.run(
+                None, {self._classifier_input: np.array([[transcript_buffer[-CACHE_TAIL_CHARS:]]])}
+            )
+            probabilities = outputs[1][0]
+            # skl2onnx's ZipMap yields {label: p}; without it, a [p0, p1] row
+            if isinstance(probabilities, dict):
+                probability = float(probabilities.get(1, probabilities.get("1", 0.0)))
+            else:
+                probability = float(probabilities[1])
+        except Exception:
+            return None
+
+        if abs(probability - self.threshold) < TRIGGER_CLASSIFIER_MARGIN:
+            return None
+        return TriggerDecision(
+            should_respond=probability >= self.threshold,
+            confidence=probability,
+            reason=f"Classifier confidence: {probability:.2f} (threshold: {self.threshold})",
+            latency_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+        )
+
+    def _ask_llm(self, transcript_buffer: str, start_ns: int) -> TriggerDecision:
+        """Ask Ollama for a YES/NO decision (raises on HTTP errors)."""
+        # Truncate very long transcripts (focus on recent context)
+        if len(transcript_buffer) > 2000:
+            transcript_buffer = transcript_buffer[-2000:]
+
+        # Only the transcript is encoded per call, without its quotes
+        body = b"".join((self._generate_head, _dumps(transcript_buffer)[1:-1], _PROMPT_SUFFIX))
+
+        with self._slots:
+            response = self._client.post(
+                f"{self.ollama_url}/api/generate",
+                content=body,
+                headers={"Content-Type": "application/json"},
+            )
+        response.raise_for_status()
+        result = _loads(response.content)
+
+        latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+
+        # Parse YES/NO from the first letter (one token may be just "Y" or "N",
+        # usually with a leading space)
+        raw_output = result.get("response", "").lstrip()
+        first = raw_output[:1].upper()
+
+        if first == "Y":
+            should_respond, confidence = True, 1.0
+        elif first == "N":
+            should_respond, confidence = False, 0.0
+        else:
+            # Fallback: try to parse as number (a single token, so no split)
+            try:
+                confidence = float(raw_output[:8])
+                confidence = max(0.0, min(1.0, confidence))
+                should_respond = confidence >= self.threshold
+            except ValueError:
+                confidence = 0.0
+                should_respond = False
+
+        return TriggerDecision(
+            should_respond=should_respond,
+            confidence=confidence,
+            reason=f"LLM confidence: {confidence:.2f} (threshold: {self.threshold})",
+            latency_ms=latency_ms,
+        )
+
+    def should_respond_batch(self, transcripts: list) -> list:
+        """
+        Evaluate several transcripts (e.g. one per meeting) concurrently.
+
+        Requests run in parallel up to TRIGGER_MAX_CONCURRENCY, so Ollama
+        can batch them across its parallel slots.
+
+        Returns:
+            TriggerDecision per transcript, in order
+        """
+        return list(self._pool.map(self.should_respond, transcripts))
+
+    def submit(self, transcript_buffer: Union[str, deque]) -> Future:
+        """
+        Evaluate a transcript in the background.
+
+        Returns:
+            Future resolving to a TriggerDecision
+        """
+        return self._pool.submit(self.should_respond, transcript_buffer)
+
+    def ensure_ready(self) -> int:
+        """
+        Load the model and prefill the system prompt with one tiny generate call.
+        Returns latency in ms (raises if Ollama or the model is unavailable).
+        """
+        start_ns = time.perf_counter_ns()
+        response = self._client.post(
+            f"{self.ollama_url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": ".",
+                # Same system prompt as decisions, so its KV prefix is cached
+                "system": TRIGGER_SYSTEM_PROMPT,
+                "stream": False,
+                "keep_alive": TRIGGER_KEEP_ALIVE,
+                "options": {"num_predict": 1},
+            },
+        )
+        response.raise_for_status()
+        self._ready_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        return self._ready_ms
+
     def health_check(self) -> bool:
-        """Check if Ollama is available and model is loaded."""
+        """Check if Ollama is available and model is loaded (loads it if not)."""
         try:
-            response = self._client.get(f"{self.ollama_url}/api/tags")
-            if response.status_code != 200:
-                return False
-            tags = response.json()
-            models = [m["name"] for m in tags.get("models", [])]
-            # Check if our model (or base name) is loaded
-            return any(self.model.split(":")[0] in m for m in models)
+            self.ensure_ready()
+            return True
         except Exception:
             return False
 
-    def warm_up(self) -> float:
+    def warm_up(self) -> int:
         """
-        Send a dummy request to warm up the model.
+        Warm up the model, reusing a preceding health_check's request.
         Returns latency in ms.
         """
-        decision = self.should_respond("Hello, this is a test.")
-        return decision.latency_ms
+        if self._ready_ms is None:
+            start_ns = time.perf_counter_ns()
+            try:
+                self.ensure_ready()
+            except Exception:
+                return (time.perf_counter_ns() - start_ns) // 1_000_000
+        return self._ready_ms
 
     def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client and the background pool."""
+        self._pool.shutdown(wait=True)
         self._client.close()
 
 
 # Singleton for reuse across calls
 _trigger_client: Optional[TriggerClient] = None
+_trigger_client_lock = threading.Lock()
 
 
 def get_trigger_client() -> TriggerClient:
     """Get or create the global trigger client."""
     global _trigger_client
     if _trigger_client is None:
-        _trigger_client = TriggerClient()
+        with _trigger_client_lock:
+            if _trigger_client is None:
+                _trigger_client = TriggerClient()
     return _trigger_client
 
 
+def _reset_client():
+    """Drop the inherited client in a forked child; its pooled sockets belong to the parent."""
+    global _trigger_client, _trigger_client_lock
+    _trigger_client = None
+    _trigger_client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_client)
+
+
 # --- Convenience functions ---
 
-def should_respond(transcript_buffer: str) -> TriggerDecision:
+def should_respond(transcript_buffer: Union[str, deque]) -> TriggerDecision:
     """Quick check if bot should respond to transcript."""
     return get_trigger_client().should_respond(transcript_buffer)
 
 
-def warm_up() -> float:
+def warm_up() -> int:
     """Warm up the trigger model. Call at startup."""
     return get_trigger_client().warm_up()
 